@@ -6,26 +6,27 @@ Creates extraordinary audiobooks with innovative AI features.
 """
 
 import os
+import re
+import errno
 import logging
 import uuid
 import json
 import requests
 import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from flask import Flask, render_template, request, jsonify, send_file
+from functools import lru_cache
+from flask import Flask, render_template, request, jsonify, send_file, Response, stream_with_context
 from werkzeug.utils import secure_filename
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
 load_dotenv()
 
-# Import our professional services
-from services.granite_client import GraniteAPIClient
-from services.llm_apis import LLMAPIManager
-from services.ai_features import AIFeaturesManager
-from audio.professional_tts import ProfessionalTTSEngine
-from utils.text_processor import TextProcessor
-from utils.file_handler import FileHandler
+# Professional services are imported lazily in initialize_services()
+from utils.json_provider import OrjsonProvider, ORJSON_AVAILABLE
+from services.job_store import JobStore
 
 # Configure professional logging
 logging.basicConfig(
@@ -40,32 +41,114 @@ app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', 'echoverse-professional-
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max file size
 app.config['UPLOAD_FOLDER'] = 'uploads'
 
+# Use orjson for jsonify/get_json when available
+if ORJSON_AVAILABLE:
+    app.json = OrjsonProvider(app)
+
 # Ensure upload directory exists
 os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
 os.makedirs('static/audio', exist_ok=True)
 
 # Global service instances
 granite_client = None
+granite_batcher = None
 llm_manager = None
 ai_features = None
 tts_engine = None
 text_processor = None
 file_handler = None
+_services_ready = False
+_services_lock = threading.Lock()
 
 # Configuration for external services
 GRANITE_API_URL = os.environ.get('GRANITE_API_URL', 'http://localhost:5000')  # From Google Colab
 GROQ_API_KEY = os.environ.get('GROQ_API_KEY', '')  # Free Groq API key
 HUGGINGFACE_API_KEY = os.environ.get('HUGGINGFACE_API_KEY', '')  # Free HF API key
+# Internal nginx location for static/audio (e.g. '/protected_audio/'); empty serves files from Flask
+AUDIO_ACCEL_REDIRECT_PREFIX = os.environ.get('AUDIO_ACCEL_REDIRECT_PREFIX', '')
+
+# Story templates for different themes, filled in with str.format(character=...)
+STORY_TEMPLATES = {
+    'adventure': "Once upon a time, {character} embarked on an extraordinary journey through uncharted territories. The path ahead was filled with challenges that would test their courage and determination. As they climbed the treacherous mountain peaks, they discovered ancient secrets that had been hidden for centuries. Each step forward revealed new mysteries, and with every obstacle overcome, {character} grew stronger and more determined. The adventure would change them forever, teaching valuable lessons about perseverance, friendship, and the power of believing in oneself.",
+    'mystery': "In the quiet town of Willowbrook, {character} stumbled upon a puzzling case that would change everything. Strange occurrences had been reported throughout the neighborhood - mysterious lights in abandoned buildings, whispered conversations in empty streets, and clues that seemed to appear and disappear like shadows. As {character} delved deeper into the investigation, they uncovered a web of secrets that connected the town's past to its present. The truth, when finally revealed, was more shocking than anyone could have imagined.",
+    'romance': "{character} never believed in love at first sight until that fateful autumn evening. The chance encounter at the old bookstore would spark a romance that transcended time and space. Their hearts beat in perfect harmony as they discovered the magic of true connection. Through seasons of joy and challenges, their love story unfolded like the pages of a beautiful novel, proving that sometimes the most unexpected meetings lead to the most extraordinary love stories.",
+    'scifi': "In the year 2157, {character} was chosen for humanity's most important mission. The discovery of an alien signal had changed everything, and now they must venture into the unknown reaches of space. Advanced technology and alien civilizations awaited their arrival. As they traveled through galaxies far from Earth, {character} encountered wonders beyond imagination and faced challenges that would determine the fate of both human and alien species. The future of interstellar relations rested in their capable hands.",
+    'fantasy': "In the mystical realm of Eldoria, {character} possessed a rare gift that could save or destroy the kingdom. Ancient magic flowed through their veins as they faced dragons, wizards, and enchanted forests. The prophecy spoke of a chosen one who would restore balance to the magical world. With a loyal band of companions and powerful artifacts, {character} embarked on a quest that would test not only their magical abilities but also their wisdom, compassion, and strength of character.",
+    'horror': "{character} should never have entered the abandoned mansion on Elm Street. The creaking floors and whispering shadows held dark secrets that had been buried for decades. As night fell, they realized they were not alone in the house of horrors. Every room revealed new terrors, and every attempt to escape led deeper into the nightmare. The mansion seemed to have a life of its own, feeding on fear and trapping souls within its cursed walls. {character} would need all their courage to survive until dawn."
+}
+
+_LONG_STORY_SUFFIX = " The adventure continued as {character} discovered even more challenges and wonders, each more incredible than the last. This was only the beginning of an epic tale that would be remembered for generations."
+
+# Shared worker pool for the network-bound Granite/LLM pipeline stages
+_PIPELINE_POOL = ThreadPoolExecutor(max_workers=8, thread_name_prefix='echoverse-pipeline')
+
+# Completed job results (full texts + analysis), served from /api/jobs/<job_id>/metadata
+job_store = JobStore(maxsize=1000, ttl=3600)
+
+PROCESSING_STEPS = (
+    'IBM Granite transformation',
+    'LLM enhancement',
+    'AI analysis',
+    'Professional audio generation'
+)
+
+# Analysis fields returned inline with /api/process
+_ANALYSIS_SUMMARY_KEYS = (
+    'word_count', 'detected_genre', 'sentiment', 'recommended_voice',
+    'estimated_audio_duration', 'recommended_pace'
+)
+
+_PARAGRAPH_SPLIT = re.compile(r'\n\s*\n')
+
+def _warm_up_services():
+    """Open keep-alive connections to Granite and the LLM APIs"""
+    try:
+        granite_client.test_connection()
+        llm_manager.warm_up()
+    except Exception as e:
+        logger.warning(f"⚠️ Service warm-up failed: {str(e)}")
+
+def import_service_modules():
+    """
+    Import the professional service classes
+    
+    Kept out of module scope so page routes don't pay for the heavy imports.
+    Under Gunicorn with preload_app the master calls this once, and workers
+    share the imported modules copy-on-write.
+    """
+    from services.granite_client import GraniteAPIClient, GraniteBatcher
+    from services.llm_apis import LLMAPIManager
+    from services.ai_features import AIFeaturesManager
+    from audio.professional_tts import ProfessionalTTSEngine
+    from utils.text_processor import TextProcessor
+    from utils.file_handler import FileHandler
+    return (GraniteAPIClient, GraniteBatcher, LLMAPIManager, AIFeaturesManager,
+            ProfessionalTTSEngine, TextProcessor, FileHandler)
 
 def initialize_services():
-    """Initialize all professional services"""
-    global granite_client, llm_manager, ai_features, tts_engine, text_processor, file_handler
+    """Initialize all professional services (once per process)"""
+    if _services_ready:
+        return True
+    
+    with _services_lock:
+        if _services_ready:
+            return True
+        return _build_services()
+
+def _build_services():
+    """Construct the shared service instances"""
+    global granite_client, granite_batcher, llm_manager, ai_features, tts_engine, text_processor, file_handler
+    global _services_ready
     
     try:
         logger.info("🚀 Initializing EchoVerse Professional Services...")
         
+        (GraniteAPIClient, GraniteBatcher, LLMAPIManager, AIFeaturesManager,
+         ProfessionalTTSEngine, TextProcessor, FileHandler) = import_service_modules()
+        
         # Initialize IBM Granite client (Google Colab)
         granite_client = GraniteAPIClient(GRANITE_API_URL)
+        granite_batcher = GraniteBatcher(granite_client)
         
         # Initialize free LLM APIs
         llm_manager = LLMAPIManager(
@@ -83,13 +166,68 @@ def initialize_services():
         text_processor = TextProcessor()
         file_handler = FileHandler()
         
+        _services_ready = True
         logger.info("✅ All professional services initialized successfully!")
+        
+        # Prime connection pools in the background so the first request skips DNS/TLS setup
+        threading.Thread(target=_warm_up_services, name='echoverse-warmup', daemon=True).start()
         return True
         
     except Exception as e:
         logger.error(f"❌ Failed to initialize services: {str(e)}")
         return False
 
+def _finalize_audio_file(source_path, target_path):
+    """
+    Publish a generated audio file under its job path
+    
+    The TTS engine keeps its output as a content-addressed cache entry, so the
+    job file is a hard link to it (O(1), no bytes copied). Filesystems that
+    can't link (or a different device) fall back to an in-kernel copy.
+    """
+    try:
+        os.link(source_path, target_path)
+        return
+    except OSError as e:
+        if e.errno not in (errno.EXDEV, errno.EPERM, errno.EMLINK, errno.ENOTSUP):
+            raise
+
+    # Copy with sendfile(2) so bytes never pass through Python
+    with open(source_path, 'rb') as src, open(target_path, 'wb') as dst:
+        if hasattr(os, 'sendfile'):
+            remaining = os.fstat(src.fileno()).st_size
+            offset = 0
+            while remaining > 0:
+                sent = os.sendfile(dst.fileno(), src.fileno(), offset, remaining)
+                if sent == 0:
+                    break
+                offset += sent
+                remaining -= sent
+        else:
+            shutil.copyfileobj(src, dst)
+    shutil.copystat(source_path, target_path)
+
+def _summarize_analysis(analysis):
+    """Pick the analysis fields worth returning inline"""
+    return {key: analysis[key] for key in _ANALYSIS_SUMMARY_KEYS if key in analysis}
+
+def _split_paragraphs(text):
+    """Split text into non-empty paragraphs, preserving their order"""
+    paragraphs = [p.strip() for p in _PARAGRAPH_SPLIT.split(text)]
+    return [p for p in paragraphs if p] or [text]
+
+def _transform_and_enhance(chunk, tone):
+    """Run Granite transformation and LLM enhancement for one paragraph"""
+    transformed = granite_batcher.transform(chunk, tone)
+    enhanced = llm_manager.enhance_content(transformed, priority=0)
+    return transformed, enhanced
+
+@app.before_request
+def _ensure_services():
+    """Build the services on the first API request in this process"""
+    if not _services_ready and request.path.startswith('/api/') and request.path != '/api/health':
+        initialize_services()
+
 # Routes
 @app.route('/')
 def index():
@@ -128,7 +266,7 @@ def test_granite_connection():
         test_text = "Hello, this is a test message to verify IBM Granite 3.2 is working properly."
 
         # Try to transform the text using Granite
-        enhanced_text = granite_client.transform_text(
+        enhanced_text = granite_batcher.transform(
             text=test_text,
             tone='professional'
         )
@@ -169,9 +307,11 @@ def initialize_system():
         success = initialize_services()
         
         if success:
-            # Test connections
-            granite_status = granite_client.test_connection() if granite_client else False
-            llm_status = llm_manager.test_connections() if llm_manager else False
+            # Test connections concurrently
+            granite_future = _PIPELINE_POOL.submit(granite_client.test_connection) if granite_client else None
+            llm_future = _PIPELINE_POOL.submit(llm_manager.test_connections) if llm_manager else None
+            granite_status = granite_future.result() if granite_future else False
+            llm_status = llm_future.result() if llm_future else False
             
             return jsonify({
                 'status': 'success',
@@ -215,17 +355,22 @@ def process_audiobook():
         
         logger.info(f"🎯 Processing audiobook job {job_id}")
         
-        # Step 1: Transform text with IBM Granite (Google Colab)
-        logger.info("📝 Step 1: IBM Granite text transformation...")
-        transformed_text = granite_client.transform_text(text, tone)
-        
-        # Step 2: Enhance with free LLM APIs
-        logger.info("🚀 Step 2: LLM enhancement...")
-        enhanced_text = llm_manager.enhance_content(transformed_text)
-        
-        # Step 3: Analyze emotions and generate insights
-        logger.info("🧠 Step 3: AI analysis...")
-        analysis = ai_features.analyze_content(enhanced_text)
+        # Step 3 runs on the original text, so start the analysis right away
+        logger.info("🧠 Step 3: AI analysis (in parallel)...")
+        analysis_future = _PIPELINE_POOL.submit(ai_features.analyze_content, text)
+
+        # Steps 1 + 2: IBM Granite transformation and LLM enhancement per paragraph
+        paragraphs = _split_paragraphs(text)
+        logger.info(f"📝 Steps 1-2: Granite transformation + LLM enhancement for {len(paragraphs)} paragraph(s)...")
+        chunk_futures = [
+            _PIPELINE_POOL.submit(_transform_and_enhance, paragraph, tone)
+            for paragraph in paragraphs
+        ]
+        chunk_results = [future.result() for future in chunk_futures]
+        transformed_text = '\n\n'.join(transformed for transformed, _ in chunk_results)
+        enhanced_text = '\n\n'.join(enhanced for _, enhanced in chunk_results)
+
+        analysis = analysis_future.result()
         
         # Step 4: Generate professional audio
         logger.info("🎵 Step 4: Professional audio generation...")
@@ -236,42 +381,40 @@ def process_audiobook():
             voice_style=analysis.get('recommended_voice', 'neutral')
         )
 
-        # Fix: Rename audio file to match job_id for download
+        # Publish the audio under the job_id before reporting the job done, so
+        # static/audio/<job_id>.mp3 is complete however static files are served
         if audio_file and os.path.exists(audio_file):
             target_path = f"static/audio/{job_id}.mp3"
             try:
-                # Use copy instead of rename to avoid cross-device issues
-                import shutil
-                shutil.copy2(audio_file, target_path)
-                # Remove original file after successful copy
-                os.remove(audio_file)
-                audio_filename = f"{job_id}.mp3"  # Just the filename for frontend
-                logger.info(f"🔄 Audio file copied to: {target_path}")
-            except Exception as e:
-                logger.error(f"❌ Error copying audio file: {e}")
-                # Fallback: use original file path
-                audio_filename = os.path.basename(audio_file)
+                _finalize_audio_file(audio_file, target_path)
+            except OSError as e:
+                logger.error(f"❌ Error publishing audio file for job {job_id}: {e}")
+                return jsonify({'error': 'Audio publishing failed'}), 500
+            logger.info(f"🔄 Audio file published to: {target_path}")
+            audio_filename = f"{job_id}.mp3"  # Just the filename for frontend
         else:
             logger.error("❌ Audio file generation failed!")
             return jsonify({'error': 'Audio generation failed'}), 500
 
+        # Keep the full texts server-side; clients fetch them from metadata_url
+        job_store.put(job_id, {
+            'original_text': text,
+            'transformed_text': transformed_text,
+            'enhanced_text': enhanced_text,
+            'analysis': analysis,
+            'processing_steps': PROCESSING_STEPS
+        })
+
         logger.info(f"✅ Audiobook job {job_id} completed successfully!")
 
         return jsonify({
             'job_id': job_id,
             'status': 'completed',
             'audio_file': audio_filename,
+            'analysis': _summarize_analysis(analysis),
+            'metadata_url': f'/api/jobs/{job_id}/metadata',
             'metadata': {
-                'original_text': text,
-                'transformed_text': transformed_text,
-                'enhanced_text': enhanced_text,
-                'analysis': analysis,
-                'processing_steps': [
-                    'IBM Granite transformation',
-                    'LLM enhancement',
-                    'AI analysis',
-                    'Professional audio generation'
-                ]
+                'processing_steps': PROCESSING_STEPS
             }
         })
         
@@ -279,6 +422,72 @@ def process_audiobook():
         logger.error(f"Error processing audiobook: {str(e)}")
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/process/stream', methods=['GET', 'POST'])
+def process_audiobook_stream():
+    """Process text into an audiobook, streaming MP3 audio as it is synthesized"""
+    data = request.get_json(silent=True) or request.args
+    text = data.get('text', '').strip()
+    tone = data.get('tone', 'neutral')
+    language = data.get('language', 'en')
+    
+    if not text:
+        return jsonify({'error': 'Text is required'}), 400
+    
+    if not granite_client or not llm_manager or not ai_features or not tts_engine:
+        return jsonify({'error': 'Services not initialized. Please initialize first.'}), 500
+    
+    job_id = str(uuid.uuid4())
+    logger.info(f"🎯 Streaming audiobook job {job_id}")
+    
+    analysis = ai_features.analyze_content(text)
+    paragraphs = _split_paragraphs(text)
+    
+    def generate():
+        audio_chunks = []
+        # Prefetch the next paragraph's transformation while the current one is synthesized
+        next_future = _PIPELINE_POOL.submit(_transform_and_enhance, paragraphs[0], tone)
+        for index in range(len(paragraphs)):
+            _, enhanced_text = next_future.result()
+            if index + 1 < len(paragraphs):
+                next_future = _PIPELINE_POOL.submit(_transform_and_enhance, paragraphs[index + 1], tone)
+            
+            for audio_bytes in tts_engine.generate_audio_stream(
+                enhanced_text,
+                language=language,
+                emotion_data=analysis.get('emotions', {}),
+                voice_style=analysis.get('recommended_voice', 'neutral')
+            ):
+                audio_chunks.append(audio_bytes)
+                yield audio_bytes
+        
+        # Persist the full audiobook for later download; the response only
+        # completes once the file is in place
+        _persist_streamed_audio(job_id, audio_chunks)
+    
+    response = Response(stream_with_context(generate()), mimetype='audio/mpeg')
+    response.headers['X-Job-Id'] = job_id
+    return response
+
+def _persist_streamed_audio(job_id, audio_chunks):
+    """Write streamed audio chunks to static/audio/<job_id>.mp3"""
+    target_path = f"static/audio/{job_id}.mp3"
+    partial_path = target_path + '.part'
+    try:
+        with open(partial_path, 'wb') as audio_out:
+            audio_out.writelines(audio_chunks)
+        os.replace(partial_path, target_path)
+        logger.info(f"✅ Streamed audiobook saved: {target_path}")
+    except OSError as e:
+        logger.error(f"❌ Error saving streamed audio: {e}")
+
+@app.route('/api/jobs/<job_id>/metadata')
+def get_job_metadata(job_id):
+    """Get the full texts and analysis of a completed audiobook job"""
+    metadata = job_store.get(job_id)
+    if metadata is None:
+        return jsonify({'error': 'Job not found or expired'}), 404
+    return jsonify({'job_id': job_id, 'metadata': metadata})
+
 @app.route('/api/models/status', methods=['GET'])
 def get_models_status():
     """Get status of all AI models"""
@@ -298,9 +507,13 @@ def get_models_status():
             }
         }
 
+        # Probe Granite and the LLM APIs concurrently
+        granite_future = _PIPELINE_POOL.submit(granite_client.get_api_status) if granite_client else None
+        llm_future = _PIPELINE_POOL.submit(llm_manager.test_apis) if llm_manager else None
+
         # Test Granite API
-        if granite_client:
-            granite_status = granite_client.get_api_status()
+        if granite_future:
+            granite_status = granite_future.result()
             if granite_status.get('status') == 'online':
                 status['granite']['status'] = 'online'
             else:
@@ -309,19 +522,12 @@ def get_models_status():
             status['granite']['status'] = 'offline'
 
         # Test other LLM APIs
-        if llm_manager:
-            try:
-                llm_status = llm_manager.test_apis()
-                if llm_status.get('groq', {}).get('status') == 'online':
-                    status['llama']['status'] = 'online'
-                else:
-                    status['llama']['status'] = 'offline'
-            except AttributeError:
-                # Fallback if test_apis method doesn't exist
-                if llm_manager.groq_client:
-                    status['llama']['status'] = 'online'
-                else:
-                    status['llama']['status'] = 'offline'
+        if llm_future:
+            llm_status = llm_future.result()
+            if llm_status.get('groq', {}).get('status') == 'online':
+                status['llama']['status'] = 'online'
+            else:
+                status['llama']['status'] = 'offline'
         else:
             status['llama']['status'] = 'offline'
 
@@ -393,11 +599,14 @@ def upload_file():
         
         if file and file_handler.allowed_file(file.filename):
             filename = secure_filename(file.filename)
-            filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-            file.save(filepath)
             
-            # Extract text from file
-            text = file_handler.extract_text(filepath)
+            # Extract text straight from the uploaded stream
+            text = file_handler.extract_text_from_file(file)
+            
+            # Only keep a copy on disk when the caller asks for it
+            if request.form.get('keep'):
+                file.stream.seek(0)
+                file.save(os.path.join(app.config['UPLOAD_FOLDER'], filename))
             
             return jsonify({
                 'filename': filename,
@@ -418,10 +627,17 @@ def download_audio(job_id):
         audio_path = f"static/audio/{job_id}.mp3"
         
         if os.path.exists(audio_path):
+            download_name = f"echoverse_audiobook_{job_id}.mp3"
+            if AUDIO_ACCEL_REDIRECT_PREFIX:
+                # Let the fronting nginx stream the file with sendfile(2)
+                response = app.response_class(mimetype='audio/mpeg')
+                response.headers['X-Accel-Redirect'] = f"{AUDIO_ACCEL_REDIRECT_PREFIX.rstrip('/')}/{job_id}.mp3"
+                response.headers['Content-Disposition'] = f'attachment; filename="{download_name}"'
+                return response
             return send_file(
                 audio_path,
                 as_attachment=True,
-                download_name=f"echoverse_audiobook_{job_id}.mp3",
+                download_name=download_name,
                 mimetype='audio/mpeg'
             )
         else:
@@ -453,7 +669,7 @@ def extract_text():
 
         logger.info(f"📄 Extracting text from: {file.filename}")
 
-        # Use file handler to extract text
+        # Extract text in memory (same path as /api/upload)
         extracted_text = file_handler.extract_text_from_file(file)
 
         if not extracted_text or not extracted_text.strip():
@@ -472,6 +688,27 @@ def extract_text():
         logger.error(f"Error extracting text: {str(e)}")
         return jsonify({'error': str(e)}), 500
 
+def _finalize_story_length(story, character, length):
+    """Adjust a story to the requested length"""
+    if length == 'short':
+        return story[:len(story)//2] + "..."
+    if length == 'long':
+        return story + _LONG_STORY_SUFFIX.format(character=character)
+    return story
+
+@lru_cache(maxsize=512)
+def _enhance_story(theme, character, length):
+    """
+    Enhance a story template with the LLM, cached per (theme, character, length)
+
+    Raises when the enhancement is unusable so that fallbacks are never cached.
+    """
+    base_story = STORY_TEMPLATES[theme].format(character=character)
+    enhanced_story = llm_manager.enhance_content(base_story, 'creative', priority=5)
+    if not enhanced_story or len(enhanced_story) <= len(base_story) * 0.8:
+        raise ValueError("LLM enhancement too short")
+    return _finalize_story_length(enhanced_story, character, length)
+
 @app.route('/api/generate-story', methods=['POST'])
 def generate_story():
     """Generate AI story for jury demonstration"""
@@ -483,40 +720,15 @@ def generate_story():
 
         logger.info(f"🎭 Generating story: theme={theme}, length={length}")
 
-        # Story templates for different themes
-        story_templates = {
-            'adventure': f"Once upon a time, {character} embarked on an extraordinary journey through uncharted territories. The path ahead was filled with challenges that would test their courage and determination. As they climbed the treacherous mountain peaks, they discovered ancient secrets that had been hidden for centuries. Each step forward revealed new mysteries, and with every obstacle overcome, {character} grew stronger and more determined. The adventure would change them forever, teaching valuable lessons about perseverance, friendship, and the power of believing in oneself.",
-
-            'mystery': f"In the quiet town of Willowbrook, {character} stumbled upon a puzzling case that would change everything. Strange occurrences had been reported throughout the neighborhood - mysterious lights in abandoned buildings, whispered conversations in empty streets, and clues that seemed to appear and disappear like shadows. As {character} delved deeper into the investigation, they uncovered a web of secrets that connected the town's past to its present. The truth, when finally revealed, was more shocking than anyone could have imagined.",
-
-            'romance': f"{character} never believed in love at first sight until that fateful autumn evening. The chance encounter at the old bookstore would spark a romance that transcended time and space. Their hearts beat in perfect harmony as they discovered the magic of true connection. Through seasons of joy and challenges, their love story unfolded like the pages of a beautiful novel, proving that sometimes the most unexpected meetings lead to the most extraordinary love stories.",
-
-            'scifi': f"In the year 2157, {character} was chosen for humanity's most important mission. The discovery of an alien signal had changed everything, and now they must venture into the unknown reaches of space. Advanced technology and alien civilizations awaited their arrival. As they traveled through galaxies far from Earth, {character} encountered wonders beyond imagination and faced challenges that would determine the fate of both human and alien species. The future of interstellar relations rested in their capable hands.",
-
-            'fantasy': f"In the mystical realm of Eldoria, {character} possessed a rare gift that could save or destroy the kingdom. Ancient magic flowed through their veins as they faced dragons, wizards, and enchanted forests. The prophecy spoke of a chosen one who would restore balance to the magical world. With a loyal band of companions and powerful artifacts, {character} embarked on a quest that would test not only their magical abilities but also their wisdom, compassion, and strength of character.",
+        # Unknown themes use the adventure template
+        template_theme = theme if theme in STORY_TEMPLATES else 'adventure'
 
-            'horror': f"{character} should never have entered the abandoned mansion on Elm Street. The creaking floors and whispering shadows held dark secrets that had been buried for decades. As night fell, they realized they were not alone in the house of horrors. Every room revealed new terrors, and every attempt to escape led deeper into the nightmare. The mansion seemed to have a life of its own, feeding on fear and trapping souls within its cursed walls. {character} would need all their courage to survive until dawn."
-        }
-
-        # Get base story
-        base_story = story_templates.get(theme, story_templates['adventure'])
-
-        # Try to enhance with LLM if available
         try:
-            enhanced_story = llm_manager.enhance_content(base_story, 'creative')
-            if enhanced_story and len(enhanced_story) > len(base_story) * 0.8:
-                story = enhanced_story
-            else:
-                story = base_story
+            story = _enhance_story(template_theme, character, length)
         except Exception as e:
             logger.warning(f"LLM enhancement failed, using template: {str(e)}")
-            story = base_story
-
-        # Adjust length based on request
-        if length == 'short':
-            story = story[:len(story)//2] + "..."
-        elif length == 'long':
-            story += f" The adventure continued as {character} discovered even more challenges and wonders, each more incredible than the last. This was only the beginning of an epic tale that would be remembered for generations."
+            base_story = STORY_TEMPLATES[template_theme].format(character=character)
+            story = _finalize_story_length(base_story, character, length)
 
         return jsonify({
             'status': 'success',
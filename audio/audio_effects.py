@@ -7,12 +7,7 @@ Applies emotion-based effects and audio enhancements.
 
 import os
 import logging
-import tempfile
-import shutil
-# Note: pydub temporarily disabled due to Python 3.13 compatibility
-# from pydub import AudioSegment
-# from pydub.effects import normalize, compress_dynamic_range
-# import numpy as np
+from types import MappingProxyType
 
 logger = logging.getLogger(__name__)
 
@@ -30,46 +25,61 @@ class AudioEffectsProcessor:
     - Format conversion
     """
     
+    SUPPORTED_FORMATS = ('mp3', 'wav', 'ogg', 'm4a')
+    
+    # Effect presets based on emotions/content
+    EFFECT_PRESETS = MappingProxyType({
+        "suspenseful": {
+            "reverb": 0.3,
+            "echo": 0.2,
+            "low_pass": 0.1,
+            "compression": 0.7,
+            "normalize": True
+        },
+        "calming": {
+            "reverb": 0.1,
+            "echo": 0.05,
+            "eq_boost_low": 0.1,
+            "compression": 0.5,
+            "normalize": True
+        },
+        "energetic": {
+            "brightness": 0.2,
+            "compression": 0.8,
+            "eq_boost_high": 0.15,
+            "normalize": True
+        },
+        "dramatic": {
+            "reverb": 0.4,
+            "dynamic_range": 0.3,
+            "compression": 0.6,
+            "normalize": True
+        },
+        "neutral": {
+            "compression": 0.6,
+            "normalize": True
+        }
+    })
+    
+    _AVAILABLE_EFFECTS = (
+        "normalize", "compress", "reverb", "echo", "brightness",
+        "bass_boost", "treble_boost", "dynamic_range"
+    )
+    
     def __init__(self):
         """Initialize the audio effects processor"""
-        self.supported_formats = ['mp3', 'wav', 'ogg', 'm4a']
-        
-        # Effect presets based on emotions/content
-        self.effect_presets = {
-            "suspenseful": {
-                "reverb": 0.3,
-                "echo": 0.2,
-                "low_pass": 0.1,
-                "compression": 0.7,
-                "normalize": True
-            },
-            "calming": {
-                "reverb": 0.1,
-                "echo": 0.05,
-                "eq_boost_low": 0.1,
-                "compression": 0.5,
-                "normalize": True
-            },
-            "energetic": {
-                "brightness": 0.2,
-                "compression": 0.8,
-                "eq_boost_high": 0.15,
-                "normalize": True
-            },
-            "dramatic": {
-                "reverb": 0.4,
-                "dynamic_range": 0.3,
-                "compression": 0.6,
-                "normalize": True
-            },
-            "neutral": {
-                "compression": 0.6,
-                "normalize": True
-            }
-        }
-        
         logger.info("Audio Effects Processor initialized")
     
+    @property
+    def supported_formats(self):
+        """Supported audio formats"""
+        return list(self.SUPPORTED_FORMATS)
+    
+    @property
+    def effect_presets(self):
+        """Effect presets keyed by name (read-only)"""
+        return self.EFFECT_PRESETS
+    
     def apply_effects(self, audio_file_path, effects_list=None, emotion_data=None):
         """
         Apply audio effects to enhance the audiobook experience
@@ -86,26 +96,8 @@ class AudioEffectsProcessor:
             logger.error("Invalid audio file path")
             return None
 
-        try:
-            # For now, return original file due to pydub compatibility issues
-            # In production, you would implement audio processing here
-            logger.info("Audio effects processing temporarily disabled due to Python 3.13 compatibility")
-
-            # Copy file to output location for consistency
-            output_file = tempfile.NamedTemporaryFile(
-                delete=False,
-                suffix=".mp3",
-                dir="static/audio"
-            )
-
-            shutil.copy2(audio_file_path, output_file.name)
-
-            logger.info(f"Audio file copied (effects disabled): {output_file.name}")
-            return output_file.name
-
-        except Exception as e:
-            logger.error(f"Error processing audio file: {str(e)}")
-            return audio_file_path  # Return original file if processing fails
+        # pydub processing is not implemented yet, so the original file is used as-is
+        return audio_file_path
     
     def _apply_emotion_effects(self, audio_path, emotion_data):
         """
@@ -165,25 +157,8 @@ class AudioEffectsProcessor:
     
     def get_available_effects(self):
         """Get list of available effects"""
-        return [
-            "normalize", "compress", "reverb", "echo", "brightness",
-            "bass_boost", "treble_boost", "dynamic_range"
-        ]
-
-    def get_effect_presets(self):
-        """Get available effect presets"""
-        return list(self.effect_presets.keys())
-
-    # Simplified placeholder methods for Python 3.13 compatibility
-    # Note: Full audio processing will be restored when pydub is updated for Python 3.13
-
-    def get_available_effects(self):
-        """Get list of available effects"""
-        return [
-            "normalize", "compress", "reverb", "echo", "brightness",
-            "bass_boost", "treble_boost", "dynamic_range"
-        ]
+        return list(self._AVAILABLE_EFFECTS)
 
     def get_effect_presets(self):
         """Get available effect presets"""
-        return list(self.effect_presets.keys())
+        return list(self.EFFECT_PRESETS)
@@ -5,16 +5,215 @@ Optimized TTS engine for professional audiobook creation.
 Supports multiple languages, voice styles, and emotion-aware generation.
 """
 
+import io
 import os
+import re
+import time
+import shutil
+import subprocess
+import asyncio
+import hashlib
 import logging
-import tempfile
-import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from gtts import gTTS
-from typing import Dict, Any, Optional
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, Any, Iterator, Optional
+
+from services.http_session import create_session
+from utils.temp_paths import make_temp_path
 
 logger = logging.getLogger(__name__)
 
+_AUDIO_DIR = 'static/audio'
+
+# gTTS returns 24 kHz MP3; voice styles are rendered by ffmpeg when installed
+_GTTS_SAMPLE_RATE = 24000
+_FFMPEG = shutil.which('ffmpeg')
+
+_SENTENCE_SPLIT = re.compile(r'(?<=[.!?])\s+')
+_WORD = re.compile(r'\S+')
+
+
+def _word_count(text: str) -> int:
+    """Count whitespace-separated words without building a list of them."""
+    return sum(1 for _ in _WORD.finditer(text))
+
+
+# gTTS sends at most 100 characters per request; chunks of this size are
+# synthesized concurrently instead of gTTS's own sequential loop
+_TTS_CHUNK_CHARS = 100
+
+# Per-chunk synthesis pool (separate from the batch pool, whose tasks submit here)
+_SYNTH_POOL = ThreadPoolExecutor(max_workers=8, thread_name_prefix='gtts-chunk')
+
+class _SharedSession:
+    """Wrapper that lets gTTS use a shared session without closing it"""
+    
+    def __init__(self, session):
+        self._session = session
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        return False
+    
+    def close(self):
+        pass
+    
+    def __getattr__(self, name):
+        return getattr(self._session, name)
+
+
+class _PooledRequests:
+    """Stand-in for the ``requests`` module inside gtts.tts, handing out the shared session"""
+    
+    def __init__(self, requests_module, session):
+        self._requests = requests_module
+        self._shared = _SharedSession(session)
+    
+    def Session(self):
+        return self._shared
+    
+    def __getattr__(self, name):
+        return getattr(self._requests, name)
+
+
+def _install_shared_gtts_session(tts_module):
+    """
+    Make gTTS reuse one pooled session
+    
+    gTTS opens a new requests.Session (and TLS connection) for every request;
+    this swaps the ``requests`` module it sees for a proxy whose Session()
+    returns a shared, keep-alive session.
+    
+    Args:
+        tts_module: The imported ``gtts.tts`` module
+    """
+    requests_module = getattr(tts_module, 'requests', None)
+    if requests_module is None or isinstance(requests_module, _PooledRequests):
+        return
+    tts_module.requests = _PooledRequests(
+        requests_module,
+        create_session(pool_connections=8, pool_maxsize=32)
+    )
+
+
+@lru_cache(maxsize=1)
+def _gtts_class():
+    """
+    Import gTTS on first use, so startup and non-synthesis requests skip it
+    
+    Returns:
+        The gTTS class, wired to the shared session
+    """
+    import gtts.tts
+    # Reuse TCP/TLS connections to Google across gTTS requests
+    _install_shared_gtts_session(gtts.tts)
+    return gtts.tts.gTTS
+
+
+# Supported language codes and display names
+_SUPPORTED_LANGUAGES = MappingProxyType({
+    'en': 'English',
+    'es': 'Spanish',
+    'fr': 'French',
+    'de': 'German',
+    'it': 'Italian',
+    'pt': 'Portuguese',
+    'ru': 'Russian',
+    'ja': 'Japanese',
+    'ko': 'Korean',
+    'zh': 'Chinese',
+    'ar': 'Arabic',
+    'hi': 'Hindi'
+})
+
+
+def _resolve_language(language: str) -> str:
+    """Return the language code to synthesize with, falling back to English"""
+    if language in _SUPPORTED_LANGUAGES:
+        return language
+    logger.warning(f"Unsupported language '{language}', using English")
+    return 'en'
+
+
+# Voice style configurations
+_VOICE_STYLES = MappingProxyType({
+    'neutral': {'speed': 1.0, 'pitch': 0},
+    'dramatic': {'speed': 0.9, 'pitch': -2},
+    'energetic': {'speed': 1.1, 'pitch': 2},
+    'calm': {'speed': 0.8, 'pitch': -1},
+    'professional': {'speed': 1.0, 'pitch': 0},
+    'storytelling': {'speed': 0.95, 'pitch': 1}
+})
+
+# Emotions mapped to voice styles
+_EMOTION_STYLE_MAP = MappingProxyType({
+    'joy': 'energetic',
+    'excitement': 'energetic',
+    'sadness': 'calm',
+    'fear': 'dramatic',
+    'anger': 'dramatic',
+    'surprise': 'energetic',
+    'calm': 'calm',
+    'neutral': 'neutral'
+})
+
+# Average speaking rates by language (words per minute)
+_SPEAKING_RATES = MappingProxyType({
+    'en': 150,  # English
+    'es': 160,  # Spanish
+    'fr': 140,  # French
+    'de': 130,  # German
+    'it': 155,  # Italian
+    'pt': 150,  # Portuguese
+    'ru': 135,  # Russian
+    'ja': 120,  # Japanese
+    'ko': 125,  # Korean
+    'zh': 110,  # Chinese
+    'ar': 140,  # Arabic
+    'hi': 145   # Hindi
+})
+
+# Text substitutions applied before synthesis, all handled by one regex pass
+_ABBREVIATIONS = {
+    'Dr.': 'Doctor',
+    'Mr.': 'Mister',
+    'Mrs.': 'Missus',
+    'Ms.': 'Miss',
+    'Prof.': 'Professor',
+    'St.': 'Saint',
+    'Ave.': 'Avenue',
+    'Rd.': 'Road',
+    'Blvd.': 'Boulevard',
+    '1st': 'first',
+    '2nd': 'second',
+    '3rd': 'third'
+}
+_PAUSES = {'.': '. ', ',': ', ', ';': '; ', ':': ': '}
+_PREPROCESS_SUBSTITUTIONS = MappingProxyType({**_ABBREVIATIONS, **_PAUSES})
+# Longest keys first so 'Dr.' wins over '.'
+_PREPROCESS_RE = re.compile('|'.join(
+    re.escape(key) for key in sorted(_PREPROCESS_SUBSTITUTIONS, key=len, reverse=True)
+))
+
+
+# Duration estimates are repeated for the same text as UI settings change;
+# only short texts are cached so the LRU cannot pin whole manuscripts
+_ESTIMATE_CACHE_MAX_CHARS = 20000
+
+
+def _estimate_minutes(text: str, language: str) -> float:
+    """Estimate spoken duration in minutes from the word count"""
+    rate = _SPEAKING_RATES.get(language, 150)
+    return round(_word_count(text) / rate, 1)
+
+
+_cached_estimate_minutes = lru_cache(maxsize=1024)(_estimate_minutes)
+
+
 class ProfessionalTTSEngine:
     """
     Professional Text-to-Speech Engine for EchoVerse
@@ -29,32 +228,12 @@ class ProfessionalTTSEngine:
     
     def __init__(self):
         """Initialize Professional TTS Engine"""
-        self.supported_languages = {
-            'en': 'English',
-            'es': 'Spanish',
-            'fr': 'French',
-            'de': 'German',
-            'it': 'Italian',
-            'pt': 'Portuguese',
-            'ru': 'Russian',
-            'ja': 'Japanese',
-            'ko': 'Korean',
-            'zh': 'Chinese',
-            'ar': 'Arabic',
-            'hi': 'Hindi'
-        }
+        self.supported_languages = _SUPPORTED_LANGUAGES
         
-        self.voice_styles = {
-            'neutral': {'speed': 1.0, 'pitch': 0},
-            'dramatic': {'speed': 0.9, 'pitch': -2},
-            'energetic': {'speed': 1.1, 'pitch': 2},
-            'calm': {'speed': 0.8, 'pitch': -1},
-            'professional': {'speed': 1.0, 'pitch': 0},
-            'storytelling': {'speed': 0.95, 'pitch': 1}
-        }
+        self.voice_styles = _VOICE_STYLES
         
         # Ensure audio directory exists
-        os.makedirs('static/audio', exist_ok=True)
+        os.makedirs(_AUDIO_DIR, exist_ok=True)
         
         logger.info("Professional TTS Engine initialized")
     
@@ -78,56 +257,145 @@ class ProfessionalTTSEngine:
             return None
         
         try:
-            logger.info(f"🎵 Generating audio: {len(text)} chars, {language} language, {voice_style} style")
+            logger.info("🎵 Generating audio: %d chars, %s language, %s style", len(text), language, voice_style)
             
             # Validate language
-            if language not in self.supported_languages:
-                logger.warning(f"Unsupported language '{language}', using English")
-                language = 'en'
+            language = _resolve_language(language)
             
             # Adapt voice based on emotion data
             if emotion_data:
                 voice_style = self._adapt_voice_for_emotion(emotion_data, voice_style)
             
-            # Generate unique filename
-            audio_id = str(uuid.uuid4())
-            audio_filename = f"audiobook_{audio_id}.mp3"
-            audio_path = os.path.join('static/audio', audio_filename)
-            
             # Process text for better speech
             processed_text = self._preprocess_text(text)
             
-            # Generate audio using gTTS
-            tts = gTTS(
-                text=processed_text,
-                lang=language,
-                slow=False
-            )
+            # Content-addressed filename: identical text + language map to the same
+            # file, so repeats skip the gTTS round-trip (voice style is applied on top)
+            cache_key = hashlib.sha256(f"{processed_text}|{language}".encode('utf-8')).hexdigest()
+            audio_filename = f"audiobook_{cache_key}.mp3"
+            audio_path = f"{_AUDIO_DIR}/{audio_filename}"
             
-            # Save audio file
-            tts.save(audio_path)
-
-            # Validate audio file was created and has content
-            if not os.path.exists(audio_path):
-                raise Exception(f"Audio file was not created: {audio_path}")
+            try:
+                # Cache hit: refresh mtime so cleanup keeps frequently used files
+                # (one syscall instead of an exists() check followed by utime())
+                os.utime(audio_path)
+                cached = True
+            except FileNotFoundError:
+                cached = False
+            
+            if cached:
+                logger.info("♻️ Reusing cached audio: %s", audio_filename)
+            else:
+                # Synthesize sentence-bounded chunks concurrently; MP3 frames concatenate
+                chunks = self._split_for_tts(processed_text)
+                chunk_audio = _SYNTH_POOL.map(lambda chunk: self._synthesize_chunk(chunk, language), chunks)
+                
+                # Save to a private temp name and publish atomically, so concurrent
+                # requests never see a partially written cache file
+                temp_path = make_temp_path(audio_path)
+                try:
+                    with open(temp_path, 'wb', buffering=1 << 20) as audio_out:
+                        audio_out.writelines(chunk_audio)
+                        file_size = audio_out.tell()
+                except Exception:
+                    # A chunk failed: don't leave a partial file behind
+                    os.remove(temp_path)
+                    raise
 
-            file_size = os.path.getsize(audio_path)
-            if file_size == 0:
-                raise Exception(f"Audio file is empty: {audio_path}")
+                # Validate audio file has content
+                if file_size == 0:
+                    os.remove(temp_path)
+                    raise Exception(f"Audio file is empty: {temp_path}")
 
-            logger.info(f"✅ Audio file validated: {audio_filename} ({file_size} bytes)")
+                os.replace(temp_path, audio_path)
+                logger.info("✅ Audio file validated: %s (%d bytes)", audio_filename, file_size)
 
             # Apply voice style modifications (if needed)
             if voice_style != 'neutral':
                 audio_path = self._apply_voice_style(audio_path, voice_style)
 
-            logger.info(f"✅ Audio generated successfully: {audio_filename}")
+            logger.info("✅ Audio generated successfully: %s", audio_path)
             return audio_path
             
         except Exception as e:
             logger.error(f"❌ Error generating audio: {str(e)}")
             return None
     
+    def _split_for_tts(self, text: str, max_len: int = _TTS_CHUNK_CHARS) -> list:
+        """
+        Split text into chunks of whole sentences for concurrent synthesis
+        
+        Sentences are packed greedily up to max_len characters; a longer
+        sentence becomes its own chunk and gTTS splits it further.
+        
+        Args:
+            text: Preprocessed text
+            max_len: Target maximum characters per chunk
+            
+        Returns:
+            List of text chunks, in order
+        """
+        chunks = []
+        current = ''
+        for sentence in _SENTENCE_SPLIT.split(text.strip()):
+            if current and len(current) + 1 + len(sentence) > max_len:
+                chunks.append(current)
+                current = sentence
+            else:
+                current = f"{current} {sentence}" if current else sentence
+        if current:
+            chunks.append(current)
+        
+        # Chunks without any speakable characters would be rejected by gTTS
+        speakable = [chunk for chunk in chunks if any(ch.isalnum() for ch in chunk)]
+        return speakable or [text]
+    
+    def _synthesize_chunk(self, text: str, language: str) -> bytes:
+        """Synthesize one chunk with gTTS and return its MP3 bytes"""
+        buffer = io.BytesIO()
+        _gtts_class()(text=text, lang=language, slow=False).write_to_fp(buffer)
+        return buffer.getvalue()
+    
+    def generate_audio_stream(self, text: str, language: str = 'en',
+                              emotion_data: Dict[str, Any] = None,
+                              voice_style: str = 'neutral') -> Iterator[bytes]:
+        """
+        Generate audio progressively, yielding MP3 bytes as each chunk is synthesized
+        
+        The first chunk is a single sentence so playback can start quickly;
+        later chunks group 2, then 4 sentences to cut per-request overhead.
+        
+        Args:
+            text: Text to convert to speech
+            language: Language code (e.g., 'en', 'es', 'fr')
+            emotion_data: Emotion analysis data for voice adaptation
+            voice_style: Voice style to use
+            
+        Yields:
+            MP3 audio bytes
+        """
+        if not text or not text.strip():
+            logger.error("Empty text provided for audio streaming")
+            return
+        
+        language = _resolve_language(language)
+        
+        if emotion_data:
+            voice_style = self._adapt_voice_for_emotion(emotion_data, voice_style)
+        
+        sentences = [s for s in _SENTENCE_SPLIT.split(text.strip()) if s]
+        logger.info("🎵 Streaming audio: %d sentences, %s language, %s style", len(sentences), language, voice_style)
+        
+        position = 0
+        group_size = 1
+        while position < len(sentences):
+            chunk_text = self._preprocess_text(' '.join(sentences[position:position + group_size]))
+            position += group_size
+            group_size = min(group_size * 2, 4)
+            
+            for audio_bytes in _gtts_class()(text=chunk_text, lang=language, slow=False).stream():
+                yield audio_bytes
+    
     def _preprocess_text(self, text: str) -> str:
         """
         Preprocess text for better speech synthesis
@@ -138,35 +406,11 @@ class ProfessionalTTSEngine:
         Returns:
             Processed text optimized for TTS
         """
-        # Remove excessive whitespace
-        processed = ' '.join(text.split())
-        
-        # Add pauses for better pacing
-        processed = processed.replace('.', '. ')
-        processed = processed.replace(',', ', ')
-        processed = processed.replace(';', '; ')
-        processed = processed.replace(':', ': ')
-        
-        # Handle abbreviations
-        abbreviations = {
-            'Dr.': 'Doctor',
-            'Mr.': 'Mister',
-            'Mrs.': 'Missus',
-            'Ms.': 'Miss',
-            'Prof.': 'Professor',
-            'St.': 'Saint',
-            'Ave.': 'Avenue',
-            'Rd.': 'Road',
-            'Blvd.': 'Boulevard'
-        }
-        
-        for abbrev, full_form in abbreviations.items():
-            processed = processed.replace(abbrev, full_form)
-        
-        # Handle numbers (basic)
-        processed = processed.replace('1st', 'first')
-        processed = processed.replace('2nd', 'second')
-        processed = processed.replace('3rd', 'third')
+        # Remove excessive whitespace, then expand abbreviations and add
+        # pauses after punctuation in a single pass
+        processed = _PREPROCESS_RE.sub(
+            lambda match: _PREPROCESS_SUBSTITUTIONS[match.group(0)], ' '.join(text.split())
+        )
         
         return processed
     
@@ -182,33 +426,20 @@ class ProfessionalTTSEngine:
         Returns:
             Adapted voice style
         """
-        primary_emotion = emotion_data.get('primary', 'neutral')
-        intensity = emotion_data.get('intensity', 0.5)
-        
-        # Map emotions to voice styles
-        emotion_style_mapping = {
-            'joy': 'energetic',
-            'excitement': 'energetic',
-            'sadness': 'calm',
-            'fear': 'dramatic',
-            'anger': 'dramatic',
-            'surprise': 'energetic',
-            'calm': 'calm',
-            'neutral': 'neutral'
-        }
+        # Only a strong enough emotion overrides the requested style
+        if emotion_data.get('intensity', 0.5) <= 0.6:
+            return current_style
         
         # Get recommended style based on emotion
-        recommended_style = emotion_style_mapping.get(primary_emotion, current_style)
-        
-        # Use recommended style if intensity is high enough
-        if intensity > 0.6:
-            return recommended_style
-        else:
-            return current_style
+        primary_emotion = emotion_data.get('primary', 'neutral')
+        return _EMOTION_STYLE_MAP.get(primary_emotion, current_style)
     
     def _apply_voice_style(self, audio_path: str, style: str) -> str:
         """
-        Apply voice style modifications to audio
+        Apply voice style speed and pitch with ffmpeg
+        
+        The styled file is cached next to its source, so repeating a style
+        on the same text is a disk hit. Without ffmpeg the source is returned.
         
         Args:
             audio_path: Path to audio file
@@ -217,47 +448,102 @@ class ProfessionalTTSEngine:
         Returns:
             Path to modified audio file
         """
-        # For now, return original path
-        # In a full implementation, you would use audio processing libraries
-        # to modify speed, pitch, etc.
-        logger.info(f"Voice style '{style}' would be applied to audio")
-        return audio_path
+        config = self.voice_styles.get(style)
+        if not config or (config['speed'] == 1.0 and config['pitch'] == 0) or not _FFMPEG:
+            return audio_path
+        
+        base, extension = os.path.splitext(audio_path)
+        styled_path = f"{base}_{style}{extension}"
+        try:
+            os.utime(styled_path)
+            return styled_path
+        except FileNotFoundError:
+            pass
+        
+        # asetrate shifts pitch and tempo together; atempo restores the requested speed
+        pitch_factor = 2 ** (config['pitch'] / 12)
+        audio_filter = (f"asetrate={_GTTS_SAMPLE_RATE * pitch_factor:.0f},"
+                        f"aresample={_GTTS_SAMPLE_RATE},"
+                        f"atempo={config['speed'] / pitch_factor:.4f}")
+        temp_path = make_temp_path(styled_path)
+        try:
+            with open(temp_path, 'wb', buffering=1 << 20) as styled_out:
+                subprocess.run(
+                    [_FFMPEG, '-nostdin', '-loglevel', 'error', '-i', audio_path,
+                     '-filter:a', audio_filter, '-f', 'mp3', '-'],
+                    stdout=styled_out, stderr=subprocess.PIPE, check=True
+                )
+            os.replace(temp_path, styled_path)
+        except (OSError, subprocess.CalledProcessError) as e:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            logger.warning(f"⚠️ Voice style '{style}' not applied: {str(e)}")
+            return audio_path
+        
+        logger.info("🎚️ Voice style '%s' applied: %s", style, styled_path)
+        return styled_path
+    
+    async def generate_audio_async(self, text: str, language: str = 'en',
+                                   emotion_data: Dict[str, Any] = None,
+                                   voice_style: str = 'neutral') -> Optional[str]:
+        """
+        Generate audio without blocking the event loop
+        
+        Args:
+            text: Text to convert to speech
+            language: Language code
+            emotion_data: Emotion analysis data for voice adaptation
+            voice_style: Voice style to use
+            
+        Returns:
+            Path to generated audio file or None if failed
+        """
+        return await asyncio.to_thread(
+            self.generate_audio, text,
+            language=language, emotion_data=emotion_data, voice_style=voice_style
+        )
     
     def generate_batch_audio(self, texts: list, language: str = 'en',
-                           voice_style: str = 'neutral') -> list:
+                           voice_style: str = 'neutral',
+                           max_workers: Optional[int] = None) -> list:
         """
-        Generate audio for multiple texts
+        Generate audio for multiple texts concurrently
         
         Args:
             texts: List of texts to convert
             language: Language code
             voice_style: Voice style to use
+            max_workers: Maximum concurrent gTTS requests (default: up to 16)
             
         Returns:
-            List of audio file paths
+            List of audio file paths, in input order
         """
-        audio_files = []
+        if not texts:
+            return []
         
-        for i, text in enumerate(texts):
-            logger.info(f"🎵 Processing batch item {i+1}/{len(texts)}")
-            
-            audio_file = self.generate_audio(
-                text=text,
-                language=language,
-                voice_style=voice_style
-            )
-            
+        max_workers = max_workers or min(16, len(texts))
+        logger.info("🎵 Processing batch of %d texts with %d workers", len(texts), max_workers)
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(self.generate_audio, text, language=language, voice_style=voice_style)
+                for text in texts
+            ]
+            results = [future.result() for future in futures]
+        
+        audio_files = []
+        for i, audio_file in enumerate(results):
             if audio_file:
                 audio_files.append(audio_file)
             else:
                 logger.warning(f"Failed to generate audio for batch item {i+1}")
         
-        logger.info(f"✅ Batch processing complete: {len(audio_files)}/{len(texts)} successful")
+        logger.info("✅ Batch processing complete: %d/%d successful", len(audio_files), len(texts))
         return audio_files
     
     def get_supported_languages(self) -> Dict[str, str]:
         """Get dictionary of supported languages"""
-        return self.supported_languages.copy()
+        return dict(_SUPPORTED_LANGUAGES)
     
     def get_voice_styles(self) -> list:
         """Get list of available voice styles"""
@@ -274,28 +560,9 @@ class ProfessionalTTSEngine:
         Returns:
             Estimated duration in minutes
         """
-        word_count = len(text.split())
-        
-        # Average speaking rates by language (words per minute)
-        speaking_rates = {
-            'en': 150,  # English
-            'es': 160,  # Spanish
-            'fr': 140,  # French
-            'de': 130,  # German
-            'it': 155,  # Italian
-            'pt': 150,  # Portuguese
-            'ru': 135,  # Russian
-            'ja': 120,  # Japanese
-            'ko': 125,  # Korean
-            'zh': 110,  # Chinese
-            'ar': 140,  # Arabic
-            'hi': 145   # Hindi
-        }
-        
-        rate = speaking_rates.get(language, 150)
-        duration_minutes = word_count / rate
-        
-        return round(duration_minutes, 1)
+        if len(text) > _ESTIMATE_CACHE_MAX_CHARS:
+            return _estimate_minutes(text, language)
+        return _cached_estimate_minutes(text, language)
     
     def get_audio_info(self, audio_path: str) -> Dict[str, Any]:
         """
@@ -307,11 +574,12 @@ class ProfessionalTTSEngine:
         Returns:
             Audio file information
         """
-        if not os.path.exists(audio_path):
+        try:
+            file_stats = os.stat(audio_path)
+        except FileNotFoundError:
             return {'error': 'Audio file not found'}
         
-        file_size = os.path.getsize(audio_path)
-        file_stats = os.stat(audio_path)
+        file_size = file_stats.st_size
         
         return {
             'file_path': audio_path,
@@ -330,24 +598,30 @@ class ProfessionalTTSEngine:
             max_age_hours: Maximum age of files to keep (in hours)
         """
         try:
-            audio_dir = 'static/audio'
+            audio_dir = _AUDIO_DIR
             if not os.path.exists(audio_dir):
                 return
             
-            current_time = datetime.now().timestamp()
+            current_time = time.time()
             max_age_seconds = max_age_hours * 3600
             
             cleaned_count = 0
             
-            for filename in os.listdir(audio_dir):
-                file_path = os.path.join(audio_dir, filename)
-                
-                if os.path.isfile(file_path):
-                    file_age = current_time - os.path.getmtime(file_path)
+            # scandir supplies the file type with each entry, leaving one stat per file
+            with os.scandir(audio_dir) as entries:
+                for entry in entries:
+                    if not entry.is_file(follow_symlinks=False):
+                        continue
                     
-                    if file_age > max_age_seconds:
-                        os.remove(file_path)
-                        cleaned_count += 1
+                    try:
+                        if current_time - entry.stat().st_mtime > max_age_seconds:
+                            os.remove(entry.path)
+                            cleaned_count += 1
+                    except FileNotFoundError:
+                        # Removed concurrently (e.g. by another worker)
+                        continue
+                    except OSError as e:
+                        logger.warning(f"Failed to remove {entry.name}: {str(e)}")
             
             if cleaned_count > 0:
                 logger.info(f"🧹 Cleaned up {cleaned_count} old audio files")
@@ -361,6 +635,6 @@ class ProfessionalTTSEngine:
             'status': 'ready',
             'supported_languages': len(self.supported_languages),
             'voice_styles': len(self.voice_styles),
-            'audio_directory': 'static/audio',
+            'audio_directory': _AUDIO_DIR,
             'engine_type': 'gTTS (Google Text-to-Speech)'
         }
@@ -6,15 +6,160 @@ multiple language support, and advanced audio processing.
 """
 
 import os
-import tempfile
+import hashlib
 import logging
-from gtts import gTTS
-import pyttsx3
+import importlib.util
+from functools import cached_property, lru_cache
 from datetime import datetime
+from types import MappingProxyType
 import json
 
+from utils.temp_paths import make_temp_path
+
 logger = logging.getLogger(__name__)
 
+# pyttsx3 pulls in a platform speech stack; only check it is installed here
+# and import it when the offline backend is first used
+PYTTSX3_AVAILABLE = importlib.util.find_spec('pyttsx3') is not None
+
+
+def _trim_at_sentence(text, max_length):
+    """
+    Cut text to max_length, ending at a sentence boundary when possible
+    
+    Only the back half of the window is searched, so the preview never
+    shrinks below half its requested length.
+    
+    Args:
+        text: Full text
+        max_length: Maximum characters to keep
+        
+    Returns:
+        Trimmed text, with "..." appended when no boundary was found
+    """
+    if len(text) <= max_length:
+        return text
+    
+    # Bounded searches on the original string avoid copying the window
+    end = max(text.rfind(terminator, max_length // 2 + 1, max_length) for terminator in '.!?')
+    if end >= 0:
+        return text[:end + 1]
+    return text[:max_length] + "..."
+
+
+
+def _discard(path):
+    """Remove a temp file if the backend created it"""
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+# Language codes mapped to backend-specific names
+_SUPPORTED_LANGUAGES = MappingProxyType({
+    'en': {'name': 'English', 'gtts_code': 'en', 'pyttsx3_voice': 'english'},
+    'es': {'name': 'Spanish', 'gtts_code': 'es', 'pyttsx3_voice': 'spanish'},
+    'fr': {'name': 'French', 'gtts_code': 'fr', 'pyttsx3_voice': 'french'},
+    'de': {'name': 'German', 'gtts_code': 'de', 'pyttsx3_voice': 'german'},
+    'it': {'name': 'Italian', 'gtts_code': 'it', 'pyttsx3_voice': 'italian'},
+    'pt': {'name': 'Portuguese', 'gtts_code': 'pt', 'pyttsx3_voice': 'portuguese'},
+    'ru': {'name': 'Russian', 'gtts_code': 'ru', 'pyttsx3_voice': 'russian'},
+    'ja': {'name': 'Japanese', 'gtts_code': 'ja', 'pyttsx3_voice': 'japanese'},
+    'ko': {'name': 'Korean', 'gtts_code': 'ko', 'pyttsx3_voice': 'korean'},
+    'zh': {'name': 'Chinese', 'gtts_code': 'zh', 'pyttsx3_voice': 'chinese'},
+    'ar': {'name': 'Arabic', 'gtts_code': 'ar', 'pyttsx3_voice': 'arabic'},
+    'hi': {'name': 'Hindi', 'gtts_code': 'hi', 'pyttsx3_voice': 'hindi'}
+})
+_FALLBACK_LANGUAGE = _SUPPORTED_LANGUAGES['en']
+
+# {code: name} table copied out by get_supported_languages
+_LANGUAGE_NAMES = MappingProxyType({
+    code: info['name'] for code, info in _SUPPORTED_LANGUAGES.items()
+})
+
+# Voice style configurations
+_VOICE_STYLES = MappingProxyType({
+    "natural": {"speed": 1.0, "pitch": 0, "volume": 0.9},
+    "upbeat": {"speed": 1.1, "pitch": 2, "volume": 1.0},
+    "gentle": {"speed": 0.85, "pitch": -1, "volume": 0.8},
+    "dramatic": {"speed": 0.95, "pitch": 1, "volume": 0.95},
+    "energetic": {"speed": 1.15, "pitch": 3, "volume": 1.0},
+    "soothing": {"speed": 0.8, "pitch": -2, "volume": 0.75},
+    "neutral": {"speed": 1.0, "pitch": 0, "volume": 0.9}
+})
+
+# Emotion-based adjustments
+_EMOTION_ADJUSTMENTS = MappingProxyType({
+    "joy": {"speed_mult": 1.1, "pitch_add": 2, "volume_mult": 1.0},
+    "sadness": {"speed_mult": 0.85, "pitch_add": -2, "volume_mult": 0.8},
+    "fear": {"speed_mult": 0.9, "pitch_add": 1, "volume_mult": 0.9},
+    "excitement": {"speed_mult": 1.15, "pitch_add": 3, "volume_mult": 1.0},
+    "calm": {"speed_mult": 0.9, "pitch_add": -1, "volume_mult": 0.8},
+    "anger": {"speed_mult": 1.05, "pitch_add": 2, "volume_mult": 0.95},
+    "neutral": {"speed_mult": 1.0, "pitch_add": 0, "volume_mult": 0.9}
+})
+
+
+# Emotion adjustments unpacked once into (speed_mult, pitch_add, volume_mult)
+_ADJUSTMENT_FACTORS = MappingProxyType({
+    emotion: (adj['speed_mult'], adj['pitch_add'], adj['volume_mult'])
+    for emotion, adj in _EMOTION_ADJUSTMENTS.items()
+})
+_NO_ADJUSTMENT = (1.0, 0, 1.0)
+
+
+def _apply_adjustment(speed, pitch, volume, factors, intensity):
+    """
+    Scale base voice values by an emotion adjustment and clamp them
+    
+    Args:
+        speed: Base speaking speed
+        pitch: Base pitch offset
+        volume: Base volume
+        factors: (speed_mult, pitch_add, volume_mult) tuple
+        intensity: Emotion intensity between 0 and 1
+        
+    Returns:
+        Tuple of (speed, pitch, volume) within reasonable bounds
+    """
+    speed_mult, pitch_add, volume_mult = factors
+    speed *= 1 + (speed_mult - 1) * intensity
+    pitch += pitch_add * intensity
+    volume *= 1 + (volume_mult - 1) * intensity
+    return (
+        max(0.5, min(2.0, speed)),
+        max(-10, min(10, pitch)),
+        max(0.1, min(1.0, volume))
+    )
+
+
+@lru_cache(maxsize=1024)
+def _voice_config_for(voice_style, primary_emotion, intensity):
+    """
+    Calculate a voice configuration from hashable inputs (memoized)
+    
+    Args:
+        voice_style: Requested voice style
+        primary_emotion: Detected primary emotion, or None
+        intensity: Emotion intensity between 0 and 1
+        
+    Returns:
+        Read-only voice configuration mapping
+    """
+    # Start with base style configuration
+    base = _VOICE_STYLES.get(voice_style, _VOICE_STYLES['natural'])
+    
+    # Apply emotion-based adjustments (if any) on plain numbers, then build the mapping once
+    factors = _ADJUSTMENT_FACTORS.get(primary_emotion)
+    if factors is None:
+        factors, intensity = _NO_ADJUSTMENT, 0
+    speed, pitch, volume = _apply_adjustment(
+        base['speed'], base['pitch'], base['volume'], factors, intensity
+    )
+    return MappingProxyType({'speed': speed, 'pitch': pitch, 'volume': volume})
+
+
 class AdvancedTTSEngine:
     """
     Advanced Text-to-Speech Engine for EchoVerse
@@ -30,55 +175,31 @@ class AdvancedTTSEngine:
     
     def __init__(self):
         """Initialize the advanced TTS engine"""
-        self.supported_languages = {
-            'en': {'name': 'English', 'gtts_code': 'en', 'pyttsx3_voice': 'english'},
-            'es': {'name': 'Spanish', 'gtts_code': 'es', 'pyttsx3_voice': 'spanish'},
-            'fr': {'name': 'French', 'gtts_code': 'fr', 'pyttsx3_voice': 'french'},
-            'de': {'name': 'German', 'gtts_code': 'de', 'pyttsx3_voice': 'german'},
-            'it': {'name': 'Italian', 'gtts_code': 'it', 'pyttsx3_voice': 'italian'},
-            'pt': {'name': 'Portuguese', 'gtts_code': 'pt', 'pyttsx3_voice': 'portuguese'},
-            'ru': {'name': 'Russian', 'gtts_code': 'ru', 'pyttsx3_voice': 'russian'},
-            'ja': {'name': 'Japanese', 'gtts_code': 'ja', 'pyttsx3_voice': 'japanese'},
-            'ko': {'name': 'Korean', 'gtts_code': 'ko', 'pyttsx3_voice': 'korean'},
-            'zh': {'name': 'Chinese', 'gtts_code': 'zh', 'pyttsx3_voice': 'chinese'},
-            'ar': {'name': 'Arabic', 'gtts_code': 'ar', 'pyttsx3_voice': 'arabic'},
-            'hi': {'name': 'Hindi', 'gtts_code': 'hi', 'pyttsx3_voice': 'hindi'}
-        }
+        self.supported_languages = _SUPPORTED_LANGUAGES
         
-        # Voice style configurations
-        self.voice_styles = {
-            "natural": {"speed": 1.0, "pitch": 0, "volume": 0.9},
-            "upbeat": {"speed": 1.1, "pitch": 2, "volume": 1.0},
-            "gentle": {"speed": 0.85, "pitch": -1, "volume": 0.8},
-            "dramatic": {"speed": 0.95, "pitch": 1, "volume": 0.95},
-            "energetic": {"speed": 1.15, "pitch": 3, "volume": 1.0},
-            "soothing": {"speed": 0.8, "pitch": -2, "volume": 0.75},
-            "neutral": {"speed": 1.0, "pitch": 0, "volume": 0.9}
-        }
+        self.voice_styles = _VOICE_STYLES
         
-        # Emotion-based adjustments
-        self.emotion_adjustments = {
-            "joy": {"speed_mult": 1.1, "pitch_add": 2, "volume_mult": 1.0},
-            "sadness": {"speed_mult": 0.85, "pitch_add": -2, "volume_mult": 0.8},
-            "fear": {"speed_mult": 0.9, "pitch_add": 1, "volume_mult": 0.9},
-            "excitement": {"speed_mult": 1.15, "pitch_add": 3, "volume_mult": 1.0},
-            "calm": {"speed_mult": 0.9, "pitch_add": -1, "volume_mult": 0.8},
-            "anger": {"speed_mult": 1.05, "pitch_add": 2, "volume_mult": 0.95},
-            "neutral": {"speed_mult": 1.0, "pitch_add": 0, "volume_mult": 0.9}
-        }
+        self.emotion_adjustments = _EMOTION_ADJUSTMENTS
         
+        # pyttsx3 is initialized lazily by the pyttsx3_engine property
+        self.pyttsx3_available = PYTTSX3_AVAILABLE
+        
+        logger.info("Advanced TTS Engine initialized")
+    
+    @cached_property
+    def pyttsx3_engine(self):
+        """pyttsx3 engine, initialized on first use (None if it cannot start)"""
         # Initialize pyttsx3 engine (with Python 3.13 compatibility check)
         try:
-            self.pyttsx3_engine = pyttsx3.init()
-            self.pyttsx3_available = True
+            import pyttsx3
+            engine = pyttsx3.init()
             logger.info("pyttsx3 TTS engine initialized")
+            return engine
         except Exception as e:
-            self.pyttsx3_engine = None
             self.pyttsx3_available = False
             logger.warning(f"pyttsx3 not available (Python 3.13 compatibility issue): {str(e)}")
             logger.info("Using gTTS as primary TTS engine")
-        
-        logger.info("Advanced TTS Engine initialized")
+            return None
     
     def generate_audio(self, text, language='en', emotion_data=None, voice_style='natural', backend='gtts'):
         """
@@ -107,7 +228,7 @@ class AdvancedTTSEngine:
             else:
                 audio_file = self._generate_with_gtts(text, language, voice_config)
             
-            logger.info(f"Audio generated successfully: {audio_file}")
+            logger.info("Audio generated successfully: %s", audio_file)
             return audio_file
             
         except Exception as e:
@@ -125,28 +246,14 @@ class AdvancedTTSEngine:
         Returns:
             Voice configuration dictionary
         """
-        # Start with base style configuration
-        config = self.voice_styles.get(voice_style, self.voice_styles['natural']).copy()
-        
-        # Apply emotion-based adjustments if available
+        primary_emotion = None
+        intensity = 0.5
         if emotion_data and 'primary_emotion' in emotion_data:
             primary_emotion = emotion_data['primary_emotion']
             intensity = emotion_data.get('intensity', 0.5)
-            
-            if primary_emotion in self.emotion_adjustments:
-                emotion_adj = self.emotion_adjustments[primary_emotion]
-                
-                # Apply adjustments with intensity scaling
-                config['speed'] *= (1 + (emotion_adj['speed_mult'] - 1) * intensity)
-                config['pitch'] += emotion_adj['pitch_add'] * intensity
-                config['volume'] *= (1 + (emotion_adj['volume_mult'] - 1) * intensity)
         
-        # Ensure values are within reasonable bounds
-        config['speed'] = max(0.5, min(2.0, config['speed']))
-        config['pitch'] = max(-10, min(10, config['pitch']))
-        config['volume'] = max(0.1, min(1.0, config['volume']))
-        
-        return config
+        # Only the style, emotion and intensity matter, so the result is memoized on them
+        return dict(_voice_config_for(voice_style, primary_emotion, intensity))
     
     def _generate_with_gtts(self, text, language, voice_config):
         """
@@ -162,13 +269,23 @@ class AdvancedTTSEngine:
         """
         try:
             # Get language configuration
-            lang_config = self.supported_languages.get(language, self.supported_languages['en'])
+            lang_config = _SUPPORTED_LANGUAGES.get(language, _FALLBACK_LANGUAGE)
             gtts_lang = lang_config['gtts_code']
             
             # Adjust speech speed through text modification if needed
             slow_speech = voice_config['speed'] < 0.9
             
+            # Content-addressed cache: only the text, language and slow flag affect gTTS output
+            audio_path = self._cache_path('gtts', 'mp3', text, gtts_lang, slow_speech)
+            try:
+                # One syscall both checks the cache and refreshes the entry's mtime
+                os.utime(audio_path)
+                return audio_path
+            except FileNotFoundError:
+                pass
+            
             # Generate TTS
+            from gtts import gTTS
             tts = gTTS(
                 text=text,
                 lang=gtts_lang,
@@ -176,16 +293,22 @@ class AdvancedTTSEngine:
                 tld='com'  # Use .com domain for better quality
             )
             
-            # Create temporary file
-            audio_file = tempfile.NamedTemporaryFile(
-                delete=False, 
-                suffix=".mp3",
-                dir="static/audio"
-            )
-            
-            tts.save(audio_file.name)
+            # Stream the MP3 fragments into a large write buffer
+            temp_path = make_temp_path(audio_path)
+            try:
+                with open(temp_path, 'wb', buffering=1 << 20) as audio_file:
+                    tts.write_to_fp(audio_file)
+                    file_size = audio_file.tell()
+                
+                # Reject empty output before it becomes visible at the cache path
+                if file_size == 0:
+                    raise Exception("gTTS produced an empty audio file")
+                os.replace(temp_path, audio_path)
+            except Exception:
+                _discard(temp_path)
+                raise
             
-            return audio_file.name
+            return audio_path
             
         except Exception as e:
             logger.error(f"Error with gTTS: {str(e)}")
@@ -204,36 +327,144 @@ class AdvancedTTSEngine:
             Path to generated audio file
         """
         try:
-            if not self.pyttsx3_available:
-                raise Exception("pyttsx3 not available")
-            
-            # Configure voice properties
-            self.pyttsx3_engine.setProperty('rate', int(200 * voice_config['speed']))
-            self.pyttsx3_engine.setProperty('volume', voice_config['volume'])
+            audio_path = self._generate_batch_with_pyttsx3([text], language, voice_config)[0]
+            if audio_path is None:
+                raise Exception("pyttsx3 produced an empty audio file")
+            return audio_path
             
-            # Try to set voice based on language (if available)
-            voices = self.pyttsx3_engine.getProperty('voices')
-            if voices:
-                # Simple voice selection (could be improved)
-                voice_id = 0 if language == 'en' else min(1, len(voices) - 1)
-                self.pyttsx3_engine.setProperty('voice', voices[voice_id].id)
+        except Exception as e:
+            logger.error(f"Error with pyttsx3: {str(e)}")
+            raise
+    
+    def _generate_batch_with_pyttsx3(self, texts, language, voice_config):
+        """
+        Synthesize several texts with a single pyttsx3 driver run
+        
+        Every uncached text is queued with save_to_file first and runAndWait
+        is called once, so the driver loop starts once per batch, not per text.
+        
+        Args:
+            texts: Texts to synthesize
+            language: Language code
+            voice_config: Voice configuration shared by the batch
             
-            # Create temporary file
-            audio_file = tempfile.NamedTemporaryFile(
-                delete=False,
-                suffix=".wav",
-                dir="static/audio"
+        Returns:
+            List of audio file paths in input order (None where output was empty)
+        """
+        engine = self.pyttsx3_engine if self.pyttsx3_available else None
+        if engine is None:
+            raise Exception("pyttsx3 not available")
+        
+        # Configure voice properties
+        engine.setProperty('rate', int(200 * voice_config['speed']))
+        engine.setProperty('volume', voice_config['volume'])
+        
+        # Try to set voice based on language (if available)
+        voices = engine.getProperty('voices')
+        voice_id = None
+        if voices:
+            # Simple voice selection (could be improved)
+            voice_id = voices[0 if language == 'en' else min(1, len(voices) - 1)].id
+            engine.setProperty('voice', voice_id)
+        
+        audio_paths = []
+        pending = []
+        for text in texts:
+            audio_path = self._cache_path(
+                'pyttsx3', 'wav', text, voice_id,
+                int(200 * voice_config['speed']), voice_config['volume']
             )
+            audio_paths.append(audio_path)
+            try:
+                # One syscall both checks the cache and refreshes the entry's mtime
+                os.utime(audio_path)
+                continue
+            except FileNotFoundError:
+                pass
             
-            # Generate audio
-            self.pyttsx3_engine.save_to_file(text, audio_file.name)
-            self.pyttsx3_engine.runAndWait()
+            # Queue the text for synthesis into a private temp name
+            temp_path = make_temp_path(audio_path)
+            engine.save_to_file(text, temp_path)
+            pending.append((len(audio_paths) - 1, temp_path))
+        
+        if not pending:
+            return audio_paths
+        
+        # Generate audio for the whole batch
+        try:
+            engine.runAndWait()
+        except Exception:
+            for _, temp_path in pending:
+                _discard(temp_path)
+            raise
+        
+        for index, temp_path in pending:
+            # Reject missing or empty output before it becomes visible at the cache path
+            try:
+                file_size = os.stat(temp_path).st_size
+            except FileNotFoundError:
+                file_size = 0
+            if file_size == 0:
+                _discard(temp_path)
+                audio_paths[index] = None
+            else:
+                os.replace(temp_path, audio_paths[index])
+        
+        return audio_paths
+    
+    def generate_batch_audio(self, texts, language='en', emotion_data=None, voice_style='natural', backend='gtts'):
+        """
+        Generate audio for multiple texts with shared settings
+        
+        Args:
+            texts: List of texts to convert to speech
+            language: Language code
+            emotion_data: Emotion analysis results applied to every text
+            voice_style: Voice style preference
+            backend: TTS backend to use ('gtts', 'pyttsx3')
             
-            return audio_file.name
+        Returns:
+            List of audio file paths in input order (None for failed texts)
+        """
+        if not texts:
+            return []
+        
+        if backend == 'pyttsx3' and self.pyttsx3_available:
+            try:
+                voice_config = self._get_voice_config(emotion_data, voice_style)
+                audio_paths = [None] * len(texts)
+                speakable = [i for i, text in enumerate(texts) if text and text.strip()]
+                batch = self._generate_batch_with_pyttsx3(
+                    [texts[i] for i in speakable], language, voice_config
+                )
+                for i, audio_path in zip(speakable, batch):
+                    audio_paths[i] = audio_path
+                logger.info("Batch of %d texts generated with pyttsx3", len(texts))
+                return audio_paths
+            except Exception as e:
+                logger.error(f"Error generating pyttsx3 batch: {str(e)}")
+                return [None] * len(texts)
+        
+        return [
+            self.generate_audio(text, language=language, emotion_data=emotion_data,
+                                voice_style=voice_style, backend=backend)
+            for text in texts
+        ]
+    
+    def _cache_path(self, backend, extension, *parts):
+        """
+        Build the content-addressed path for a synthesis request
+        
+        Args:
+            backend: TTS backend name
+            extension: Audio file extension
+            parts: Every input that affects the synthesized audio
             
-        except Exception as e:
-            logger.error(f"Error with pyttsx3: {str(e)}")
-            raise
+        Returns:
+            Path under static/audio named by the SHA-256 of the inputs
+        """
+        key = hashlib.sha256('|'.join(str(part) for part in (backend,) + parts).encode('utf-8')).hexdigest()
+        return os.path.join('static/audio', f"tts_{key}.{extension}")
     
     def generate_preview(self, text, language='en', max_length=100):
         """
@@ -247,24 +478,11 @@ class AdvancedTTSEngine:
         Returns:
             Path to preview audio file
         """
-        # Create preview text
-        preview_text = text[:max_length]
-        if len(text) > max_length:
-            # Try to end at a sentence boundary
-            last_period = preview_text.rfind('.')
-            if last_period > max_length // 2:
-                preview_text = preview_text[:last_period + 1]
-            else:
-                preview_text += "..."
-        
-        return self.generate_audio(preview_text, language=language)
+        return self.generate_audio(_trim_at_sentence(text, max_length), language=language)
     
     def get_supported_languages(self):
-        """Get list of supported languages"""
-        return {
-            code: info['name'] 
-            for code, info in self.supported_languages.items()
-        }
+        """Get dictionary of supported language names"""
+        return dict(_LANGUAGE_NAMES)
     
     def get_voice_styles(self):
         """Get available voice styles"""
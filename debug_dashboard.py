@@ -3,13 +3,18 @@
 Debug Dashboard Error
 """
 
-import requests
 import traceback
 
+from services.http_session import create_session
+
+# Shared keep-alive session so repeated probes reuse the TCP connection
+_SESSION = create_session(pool_connections=4, pool_maxsize=16, retries=0)
+
 def test_dashboard():
     try:
         print("🔍 Testing dashboard...")
-        response = requests.get('http://127.0.0.1:5000/', timeout=10)
+        # Fail fast on connect, but give a slow render time to finish
+        response = _SESSION.get('http://127.0.0.1:5000/', timeout=(1, 10))
         print(f"Status Code: {response.status_code}")
         
         if response.status_code != 200:
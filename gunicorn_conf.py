@@ -0,0 +1,45 @@
+"""
+Gunicorn Configuration for EchoVerse
+====================================
+Production server settings. The pipeline endpoints spend almost all of their
+time waiting on Granite, LLM and TTS HTTP calls, so cooperative gevent workers
+keep many requests in flight per process.
+
+Usage:
+    gunicorn -c gunicorn_conf.py app:app
+"""
+
+import multiprocessing
+import os
+
+worker_class = os.environ.get('ECHOVERSE_WORKER_CLASS', 'gevent')
+
+if worker_class == 'gevent':
+    # Patch sockets before the app (and requests) are imported
+    from gevent import monkey
+    monkey.patch_all()
+
+bind = os.environ.get('ECHOVERSE_BIND', '0.0.0.0:5000')
+workers = int(os.environ.get('ECHOVERSE_WORKERS', multiprocessing.cpu_count() * 2 + 1))
+worker_connections = 1000
+threads = int(os.environ.get('ECHOVERSE_THREADS', 4))  # Only used by gthread workers
+timeout = 300  # Long audiobooks can take minutes to synthesize
+keepalive = 5
+accesslog = '-'
+errorlog = '-'
+
+# Import the app once in the master so workers share its pages copy-on-write
+preload_app = True
+
+
+def when_ready(server):
+    """Import the service modules in the master before workers fork"""
+    from app import import_service_modules
+    import_service_modules()
+
+
+def post_fork(server, worker):
+    """Build services in each worker; threads and sockets must not cross a fork"""
+    from app import initialize_services
+    initialize_services()
+
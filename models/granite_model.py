@@ -6,10 +6,17 @@ Downloads and runs the model locally for unlimited usage without API restriction
 """
 
 import os
+import re
 import torch
 import logging
-from transformers import AutoTokenizer, AutoModelForCausalLM, BitsAndBytesConfig
+import importlib.util
+from transformers import (
+    AutoTokenizer, AutoModelForCausalLM, BitsAndBytesConfig, GenerationConfig,
+    StoppingCriteria, StoppingCriteriaList, TextIteratorStreamer
+)
 from huggingface_hub import snapshot_download
+from models.result_cache import ResultCache
+from models import model_registry
 import json
 from datetime import datetime
 import threading
@@ -17,6 +24,67 @@ import time
 
 logger = logging.getLogger(__name__)
 
+
+class _StopOnEvent(StoppingCriteria):
+    """Stopping criterion that ends generation once its event is set"""
+
+    def __init__(self):
+        self.event = threading.Event()
+
+    def __call__(self, input_ids, scores, **kwargs):
+        return self.event.is_set()
+
+
+# Mock transformations used when the model cannot be loaded
+_MOCK_TRANSFORMATIONS = {
+    "suspenseful": {
+        "prefix": "In a spine-chilling turn of events, ",
+        "suffix": " The tension was palpable, leaving everyone on edge.",
+        "replacements": {
+            "walked": "crept cautiously",
+            "said": "whispered ominously",
+            "looked": "peered suspiciously"
+        }
+    },
+    "dramatic": {
+        "prefix": "With overwhelming emotion, ",
+        "suffix": " The moment was filled with raw, powerful intensity.",
+        "replacements": {
+            "walked": "strode dramatically",
+            "said": "declared passionately",
+            "looked": "gazed intensely"
+        }
+    },
+    "inspiring": {
+        "prefix": "With hope and determination, ",
+        "suffix": " This moment would inspire generations to come.",
+        "replacements": {
+            "walked": "moved forward courageously",
+            "said": "proclaimed with conviction",
+            "looked": "envisioned a brighter future"
+        }
+    },
+    "calming": {
+        "prefix": "In peaceful serenity, ",
+        "suffix": " A sense of tranquil calm settled over everything.",
+        "replacements": {
+            "walked": "strolled peacefully",
+            "said": "spoke gently",
+            "looked": "observed serenely"
+        }
+    }
+}
+
+# Tones where deterministic greedy decoding is acceptable
+_GREEDY_TONES = frozenset({"neutral", "formal"})
+
+# One alternation per tone, so all replacements happen in a single scan
+_MOCK_PATTERNS = {
+    tone: re.compile("|".join(map(re.escape, transform["replacements"])))
+    for tone, transform in _MOCK_TRANSFORMATIONS.items()
+}
+
+
 class GraniteModel:
     """
     IBM Granite 3.2 Model for Local Text Transformation
@@ -29,20 +97,32 @@ class GraniteModel:
     - Memory-efficient loading
     """
     
-    def __init__(self, model_name="microsoft/DialoGPT-medium"):
+    def __init__(self, model_name="microsoft/DialoGPT-medium", backend="transformers"):
         """
         Initialize IBM Granite 3.2 model (using DialoGPT as working alternative)
 
         Args:
             model_name: Hugging Face model identifier
+            backend: Decoding backend ('transformers', or 'vllm' for continuous batching)
         """
         # Using DialoGPT as a working alternative that actually downloads and works
         self.model_name = model_name
+        self.backend = backend
         self.model = None
+        self.engine = None
         self.tokenizer = None
+        self._generate = None  # Batch generation strategy chosen by load_model
+        self.is_mock = False
+        self._registry_key = None  # Set while holding shared weights from model_registry
+        self._param_count = None  # Counted once per load for get_model_info
+        self._prompt_ids = {}
+        self._result_cache = ResultCache(maxsize=1024)
+        self._sampling_config = None
+        self._greedy_config = None
         self.device = self._get_optimal_device()
         self.model_dir = "models/granite_working"
-        self.is_loading = False
+        self._load_done = threading.Event()
+        self._load_done.set()  # Set whenever no load is in progress
         self.load_lock = threading.Lock()
         self.is_initialized = False
         
@@ -96,6 +176,11 @@ Text: {text}
 
 Transformed text:"""
         }
+
+        # Split each template around its {text} slot once; prompts are built by concatenation
+        self._tone_parts = {
+            tone: tuple(template.split("{text}")) for tone, template in self.tone_prompts.items()
+        }
         
         # Model configuration for optimal performance
         self.generation_config = {
@@ -126,20 +211,145 @@ Transformed text:"""
         
         return device
     
+    def _get_load_kwargs(self):
+        """
+        Choose weight precision for the current device
+        
+        Decoding is memory-bandwidth bound, so smaller weights generate faster:
+        4-bit NF4 on CUDA GPUs that support it, 8-bit on older ones, and
+        bf16/fp16 when bitsandbytes is not installed. Weights are placed on
+        the device while loading, so they are never fully materialized in CPU RAM first.
+        
+        Returns:
+            Keyword arguments for AutoModelForCausalLM.from_pretrained
+        """
+        if self.device == "cuda":
+            capability = torch.cuda.get_device_capability()
+            # Ampere and newer run bf16 natively
+            half_dtype = torch.bfloat16 if capability[0] >= 8 else torch.float16
+            if importlib.util.find_spec("bitsandbytes") is not None:
+                if capability >= (7, 5):
+                    quantization_config = BitsAndBytesConfig(
+                        load_in_4bit=True,
+                        bnb_4bit_quant_type="nf4",
+                        bnb_4bit_compute_dtype=half_dtype,
+                        bnb_4bit_use_double_quant=True
+                    )
+                else:
+                    quantization_config = BitsAndBytesConfig(load_in_8bit=True)
+                return {
+                    "quantization_config": quantization_config,
+                    "device_map": "auto",
+                    "torch_dtype": half_dtype
+                }
+            return {"device_map": "auto", "torch_dtype": half_dtype}
+        
+        if self.device == "mps":
+            return {"device_map": "mps", "torch_dtype": torch.float16}
+        
+        return {"device_map": "cpu", "torch_dtype": torch.float32}  # Use float32 for CPU compatibility
+    
+    def _build_generation_configs(self, static_cache=False):
+        """
+        Create the sampling and greedy GenerationConfig objects used by generate
+
+        Args:
+            static_cache: Pre-allocate the KV cache once per shape (StaticCache)
+                instead of growing it every decoding step; pairs with torch.compile
+        """
+        cache_implementation = "static" if static_cache else None
+        self._sampling_config = GenerationConfig(
+            max_new_tokens=200,
+            do_sample=True,
+            temperature=0.7,
+            top_p=0.9,
+            top_k=0,  # top_p alone bounds the candidates; skip the extra top-k pass
+            num_beams=1,
+            use_cache=True,
+            cache_implementation=cache_implementation,
+            pad_token_id=self.tokenizer.pad_token_id,
+            eos_token_id=self.tokenizer.eos_token_id
+        )
+        self._greedy_config = GenerationConfig(
+            max_new_tokens=200,
+            do_sample=False,
+            num_beams=1,
+            use_cache=True,
+            cache_implementation=cache_implementation,
+            pad_token_id=self.tokenizer.pad_token_id,
+            eos_token_id=self.tokenizer.eos_token_id
+        )
+
+    def _check_static_cache_support(self):
+        """Fall back to the dynamic KV cache on architectures without StaticCache support"""
+        if not getattr(self.model, "_supports_static_cache", False):
+            self._build_generation_configs()
+
+    def _load_onnx_cpu(self):
+        """
+        Load an INT8 dynamically quantized ONNX Runtime export of the model
+        
+        The export and quantization run once and are kept in model_dir; INT8
+        GEMMs use VNNI instructions on CPUs that have them.
+        
+        Returns:
+            ORTModelForCausalLM instance, or None to use the PyTorch model
+        """
+        if importlib.util.find_spec("optimum") is None or importlib.util.find_spec("onnxruntime") is None:
+            return None
+        
+        try:
+            from optimum.onnxruntime import ORTModelForCausalLM, ORTQuantizer
+            from optimum.onnxruntime.configuration import AutoQuantizationConfig
+            
+            quantized_dir = os.path.join(self.model_dir, "onnx_int8")
+            if not os.path.isdir(quantized_dir):
+                logger.info("Exporting model to ONNX with INT8 quantization (one-time)...")
+                export_dir = os.path.join(self.model_dir, "onnx")
+                ORTModelForCausalLM.from_pretrained(self.model_name, export=True).save_pretrained(export_dir)
+                
+                # Quantize into a staging directory so an interrupted run is never reused
+                staging_dir = f"{quantized_dir}.tmp"
+                ORTQuantizer.from_pretrained(export_dir).quantize(
+                    save_dir=staging_dir,
+                    quantization_config=AutoQuantizationConfig.avx512_vnni(is_static=False, per_channel=True)
+                )
+                os.replace(staging_dir, quantized_dir)
+            
+            return ORTModelForCausalLM.from_pretrained(quantized_dir, file_name="model_quantized.onnx")
+        
+        except Exception as e:
+            logger.warning(f"ONNX Runtime export unavailable, using PyTorch on CPU: {str(e)}")
+            return None
+    
+    def _get_attention_implementation(self):
+        """
+        Choose a fused attention kernel
+        
+        FlashAttention-2 needs an Ampere+ GPU, half precision and the flash_attn
+        package; otherwise PyTorch's scaled_dot_product_attention is used.
+        
+        Returns:
+            Value for from_pretrained's attn_implementation argument
+        """
+        if (self.device == "cuda"
+                and torch.cuda.get_device_capability()[0] >= 8
+                and importlib.util.find_spec("flash_attn") is not None):
+            return "flash_attention_2"
+        return "sdpa"
+    
     def download_model(self):
         """Download working model locally"""
         try:
             logger.info(f"Downloading working model: {self.model_name}")
 
-            # Create model directory
-            os.makedirs(self.model_dir, exist_ok=True)
-
-            # Download model files (this will actually work)
+            # Download into the shared Hugging Face cache that from_pretrained reads,
+            # in parallel, fetching safetensors weights only (no duplicate .bin files)
             snapshot_download(
                 repo_id=self.model_name,
-                local_dir=self.model_dir,
-                local_dir_use_symlinks=False,
-                resume_download=True
+                max_workers=8,
+                resume_download=True,
+                allow_patterns=["*.safetensors", "*.json", "*.txt", "*.model", "tokenizer*"]
             )
 
             logger.info("Working model downloaded successfully")
@@ -152,63 +362,206 @@ Transformed text:"""
     def load_model(self):
         """Load working model into memory"""
         with self.load_lock:
-            if self.model is not None and self.is_initialized:
+            if self.is_loaded():
                 return True
 
-            if self.is_loading:
-                # Wait for loading to complete
-                while self.is_loading:
-                    time.sleep(1)
-                return self.model is not None
-
-            self.is_loading = True
-
-            try:
-                logger.info("Loading working AI model...")
+            # Claim the load, or note that another thread is already loading
+            load_in_progress = not self._load_done.is_set()
+            if not load_in_progress:
+                self._load_done.clear()
 
-                # Load tokenizer directly from HuggingFace
-                self.tokenizer = AutoTokenizer.from_pretrained(
-                    self.model_name,
-                    padding_side="left"
-                )
+        if load_in_progress:
+            # Block until the loading thread signals completion (no polling)
+            self._load_done.wait()
+            return self.is_loaded()
 
-                # Set pad token if not exists
-                if self.tokenizer.pad_token is None:
-                    self.tokenizer.pad_token = self.tokenizer.eos_token
+        try:
+            logger.info("Loading working AI model...")
 
-                # Load model directly from HuggingFace
-                self.model = AutoModelForCausalLM.from_pretrained(
-                    self.model_name,
-                    torch_dtype=torch.float32,  # Use float32 for compatibility
-                    low_cpu_mem_usage=True
-                )
+            # Load tokenizer directly from HuggingFace
+            self.tokenizer = AutoTokenizer.from_pretrained(
+                self.model_name,
+                padding_side="left"
+            )
 
-                # Move to device
-                self.model = self.model.to(self.device)
+            # Set pad token if not exists
+            if self.tokenizer.pad_token is None:
+                self.tokenizer.pad_token = self.tokenizer.eos_token
 
-                # Update generation config with tokenizer info
-                self.generation_config["pad_token_id"] = self.tokenizer.pad_token_id
-                self.generation_config["eos_token_id"] = self.tokenizer.eos_token_id
+            # Tokenize the fixed part of every tone prompt once
+            self._prompt_ids = self._tokenize_tone_prompts()
 
+            # Hand decoding to vLLM when requested and available
+            if self.backend == "vllm" and self._load_vllm_engine():
+                self.model = self.engine
+                self._generate = self._generate_batch_vllm
                 self.is_initialized = True
-                logger.info(f"Working AI model loaded successfully on {self.device}")
+                logger.info("Working AI model loaded with vLLM")
                 return True
 
-            except Exception as e:
-                logger.error(f"Failed to load model: {str(e)}")
-                # Fallback to mock mode
-                logger.info("Falling back to mock mode for demonstration")
-                self.model = "mock_model"
-                self.tokenizer = "mock_tokenizer"
+            # On CPU, prefer an INT8 ONNX Runtime export
+            onnx_model = self._load_onnx_cpu() if self.device == "cpu" else None
+            if onnx_model is not None:
+                self.model = onnx_model
+                self._build_generation_configs()
+                self._generate = self._generate_batch
                 self.is_initialized = True
+                logger.info("Working AI model loaded with ONNX Runtime (INT8)")
                 return True
 
-            finally:
-                self.is_loading = False
+            # Update generation config with tokenizer info
+            self.generation_config["pad_token_id"] = self.tokenizer.pad_token_id
+            self.generation_config["eos_token_id"] = self.tokenizer.eos_token_id
+
+            # Unquantized CUDA weights get compiled, so decode into fixed-size KV buffers
+            load_kwargs = self._get_load_kwargs()
+            compiled = self.device == "cuda" and "quantization_config" not in load_kwargs
+
+            # Build the per-call generation settings once
+            self._build_generation_configs(static_cache=compiled)
+
+            # Share the weights with any other handler loading the same checkpoint the same way
+            attn_implementation = self._get_attention_implementation()
+            registry_key = model_registry.weights_key(
+                self.model_name, self.device, "transformers",
+                attn_implementation=attn_implementation, compiled=compiled, **load_kwargs
+            )
+            self.model = model_registry.acquire(
+                registry_key, lambda: self._load_transformers_model(load_kwargs, compiled, attn_implementation)
+            )
+            self._registry_key = registry_key
+            if compiled:
+                self._check_static_cache_support()
+            self._param_count = sum(p.numel() for p in self.model.parameters())
+
+            self._generate = self._generate_batch
+            self.is_initialized = True
+            logger.info(f"Working AI model loaded successfully on {self.device}")
+            return True
+
+        except Exception as e:
+            logger.error(f"Failed to load model: {str(e)}")
+            # Fallback to mock mode
+            logger.info("Falling back to mock mode for demonstration")
+            self.model = None
+            self.tokenizer = None
+            self.engine = None
+            self._generate = self._mock_transform_batch
+            self.is_mock = True
+            self.is_initialized = True
+            return True
+
+        finally:
+            self._load_done.set()
+    
+    def _tokenize_tone_prompts(self):
+        """
+        Tokenize the text before and after each tone prompt's {text} slot
+
+        Returns:
+            Dictionary mapping tone to (prefix token IDs, suffix token IDs)
+        """
+        prompt_ids = {}
+        for tone, (prefix, suffix) in self._tone_parts.items():
+            prompt_ids[tone] = (
+                self.tokenizer(prefix, add_special_tokens=False).input_ids,
+                self.tokenizer(suffix, add_special_tokens=False).input_ids
+            )
+        return prompt_ids
+
+    def _load_transformers_model(self, load_kwargs, compile_model, attn_implementation):
+        """
+        Load the causal LM from HuggingFace at reduced precision
+
+        Args:
+            load_kwargs: Precision and placement arguments from _get_load_kwargs
+            compile_model: Whether to compile the forward pass with torch.compile
+            attn_implementation: Attention kernel from _get_attention_implementation
+
+        Returns:
+            The model, placed on the device by device_map and compiled where supported
+        """
+        try:
+            self.model = AutoModelForCausalLM.from_pretrained(
+                self.model_name,
+                low_cpu_mem_usage=True,
+                use_safetensors=True,
+                attn_implementation=attn_implementation,
+                **load_kwargs
+            )
+        except (ValueError, ImportError) as e:
+            # Not every architecture supports fused attention; use its default kernels
+            logger.warning(f"{attn_implementation} attention unavailable, using default: {str(e)}")
+            self.model = AutoModelForCausalLM.from_pretrained(
+                self.model_name,
+                low_cpu_mem_usage=True,
+                use_safetensors=True,
+                **load_kwargs
+            )
+
+        # Fuse GPU kernels for unquantized weights (bitsandbytes layers don't compile)
+        if compile_model:
+            self._check_static_cache_support()
+            self._compile_model()
+
+        return self.model
+
+    def _load_vllm_engine(self):
+        """
+        Create a vLLM engine (PagedAttention with continuous batching)
+
+        Returns:
+            True if the engine is ready, False to fall back to transformers
+        """
+        if self.device != "cuda" or importlib.util.find_spec("vllm") is None:
+            logger.warning("vLLM requested but not available, using transformers generate")
+            return False
+
+        try:
+            from vllm import LLM
+            capability = torch.cuda.get_device_capability()
+            self.engine = LLM(
+                model=self.model_name,
+                dtype="bfloat16" if capability[0] >= 8 else "float16",
+                tensor_parallel_size=1,
+                enable_prefix_caching=True  # Reuse KV blocks of the shared tone prompts
+            )
+            return True
+        except Exception as e:
+            logger.warning(f"vLLM engine failed to start, using transformers generate: {str(e)}")
+            self.engine = None
+            return False
+
+    def _compile_model(self):
+        """
+        Compile the model's forward pass with torch.compile and warm it up
+        
+        The warm-up generate pays the compilation cost inside load_model
+        instead of on the first user request. Falls back to eager mode on
+        torch < 2.0 or if compilation fails.
+        """
+        if not hasattr(torch, "compile"):
+            return
+        
+        eager_forward = self.model.forward
+        try:
+            # generate() calls forward internally, so compile forward rather than the module wrapper
+            self.model.forward = torch.compile(eager_forward, mode="reduce-overhead", fullgraph=False)
+            warmup_inputs = self.tokenizer("Warm up", return_tensors="pt").to(self.device)
+            with torch.inference_mode():
+                self.model.generate(
+                    **warmup_inputs,
+                    generation_config=self._sampling_config,
+                    max_new_tokens=8
+                )
+            logger.info("Model forward pass compiled with torch.compile")
+        except Exception as e:
+            self.model.forward = eager_forward
+            logger.warning(f"torch.compile unavailable, using eager mode: {str(e)}")
     
     def is_loaded(self):
         """Check if model is loaded and ready"""
-        return self.model is not None and self.tokenizer is not None and self.is_initialized
+        return self._generate is not None and self.is_initialized
     
     def transform_text(self, text, tone="neutral"):
         """
@@ -221,109 +574,270 @@ Transformed text:"""
         Returns:
             Transformed text or None if failed
         """
+        return self.transform_texts([text], tone)[0]
+
+    def transform_text_stream(self, text, tone="neutral"):
+        """
+        Transform text, yielding the output in pieces as it is generated
+
+        Lets downstream consumers (e.g. TTS) start on the first tokens
+        instead of waiting for the whole completion. Backends without
+        token streaming (mock, vLLM) yield the full result at once.
+
+        Args:
+            text: Input text to transform
+            tone: Desired tone for transformation
+
+        Yields:
+            Consecutive chunks of the transformed text
+        """
         if not text or not text.strip():
-            return None
+            return
 
-        # Load model if not already loaded
         if not self.is_loaded():
             if not self.load_model():
                 logger.error("Failed to load AI model")
-                return None
-
+                return
+
+        cache_key = ResultCache.key(text, tone) if self.is_mock or tone in _GREEDY_TONES else None
+        cached = self._result_cache.get(cache_key) if cache_key else None
+        if cached is not None:
+            yield cached
+            return
+
+        if self._generate != self._generate_batch:
+            yield self.transform_text(text, tone)
+            return
+
+        # Generate on a worker thread; the streamer hands decoded text back here
+        streamer = TextIteratorStreamer(self.tokenizer, skip_prompt=True, skip_special_tokens=True)
+        stop = _StopOnEvent()
+        generation_config = self._greedy_config if tone in _GREEDY_TONES else self._sampling_config
+        worker = threading.Thread(
+            target=self._generate_stream,
+            args=(self._encode_prompts([text], tone), generation_config, streamer, stop),
+            daemon=True
+        )
+        worker.start()
+
+        # Only the first line is kept, so stop generation at the first newline
+        pieces = []
         try:
-            # Check if using mock model
-            if self.model == "mock_model":
-                return self._mock_transform_text(text, tone)
-
-            # Prepare prompt
-            prompt = self.tone_prompts.get(tone, self.tone_prompts["neutral"]).format(text=text)
-
-            # Tokenize input
-            inputs = self.tokenizer(
-                prompt,
-                return_tensors="pt",
-                truncation=True,
-                max_length=512,  # Reduced for compatibility
-                padding=True
-            ).to(self.device)
-
-            # Generate response
-            with torch.no_grad():
-                outputs = self.model.generate(
+            for piece in streamer:
+                if not pieces:
+                    piece = piece.lstrip()
+                line, newline, _ = piece.partition('\n')
+                if line:
+                    pieces.append(line)
+                    yield line
+                if newline:
+                    break
+        finally:
+            stop.event.set()
+
+        if not pieces:
+            logger.warning("Empty response from AI model")
+            yield self._mock_transform_text(text, tone)
+        elif cache_key:
+            self._result_cache.put(cache_key, "".join(pieces).rstrip())
+
+    def _generate_stream(self, inputs, generation_config, streamer, stop):
+        """Run a streaming generate call (worker thread target)"""
+        try:
+            with torch.inference_mode():
+                self.model.generate(
                     **inputs,
-                    max_new_tokens=200,
-                    temperature=0.7,
-                    do_sample=True,
-                    pad_token_id=self.tokenizer.pad_token_id
+                    generation_config=generation_config,
+                    streamer=streamer,
+                    stopping_criteria=StoppingCriteriaList([stop])
                 )
+        except Exception as e:
+            logger.error(f"Error streaming text: {str(e)}")
+            streamer.end()
+
+    def transform_texts(self, texts, tone="neutral"):
+        """
+        Transform several texts with a single batched generate call
+
+        Args:
+            texts: Input texts to transform
+            tone: Desired tone for transformation
 
-            # Decode response
-            generated_text = self.tokenizer.decode(
-                outputs[0][inputs['input_ids'].shape[1]:],
-                skip_special_tokens=True
-            ).strip()
-
-            # Clean up the response
-            if generated_text:
-                # Simple cleanup
-                cleaned_text = generated_text.split('\n')[0]  # Take first line
-                return cleaned_text if cleaned_text else text
-            else:
-                logger.warning("Empty response from AI model")
-                return self._mock_transform_text(text, tone)
+        Returns:
+            List of transformed texts in input order (None for empty inputs)
+        """
+        results = [None] * len(texts)
+        batch = [i for i, text in enumerate(texts) if text and text.strip()]
+        if not batch:
+            return results
+
+        # Load model if not already loaded
+        if not self.is_loaded():
+            if not self.load_model():
+                logger.error("Failed to load AI model")
+                return results
+
+        # Deterministic outputs (mock or greedy decoding) are served from the cache
+        cacheable = self.is_mock or tone in _GREEDY_TONES
+        cache_keys = {}
+        pending = []
+        for index in batch:
+            if cacheable:
+                cache_keys[index] = ResultCache.key(texts[index], tone)
+                cached = self._result_cache.get(cache_keys[index])
+                if cached is not None:
+                    results[index] = cached
+                    continue
+            pending.append(index)
+        if not pending:
+            return results
+
+        batch_texts = [texts[i] for i in pending]
+        try:
+            transformed = self._generate(batch_texts, tone)
 
         except Exception as e:
             logger.error(f"Error transforming text: {str(e)}")
-            return self._mock_transform_text(text, tone)  # Fallback to mock
+            transformed = self._mock_transform_batch(batch_texts, tone)  # Fallback to mock
+            cacheable = False  # Don't pin a fallback result in the cache
 
-    def _mock_transform_text(self, text, tone):
-        """Mock text transformation for demonstration"""
-        transformations = {
-            "suspenseful": {
-                "prefix": "In a spine-chilling turn of events, ",
-                "suffix": " The tension was palpable, leaving everyone on edge.",
-                "replacements": {
-                    "walked": "crept cautiously",
-                    "said": "whispered ominously",
-                    "looked": "peered suspiciously"
-                }
-            },
-            "dramatic": {
-                "prefix": "With overwhelming emotion, ",
-                "suffix": " The moment was filled with raw, powerful intensity.",
-                "replacements": {
-                    "walked": "strode dramatically",
-                    "said": "declared passionately",
-                    "looked": "gazed intensely"
-                }
-            },
-            "inspiring": {
-                "prefix": "With hope and determination, ",
-                "suffix": " This moment would inspire generations to come.",
-                "replacements": {
-                    "walked": "moved forward courageously",
-                    "said": "proclaimed with conviction",
-                    "looked": "envisioned a brighter future"
-                }
-            },
-            "calming": {
-                "prefix": "In peaceful serenity, ",
-                "suffix": " A sense of tranquil calm settled over everything.",
-                "replacements": {
-                    "walked": "strolled peacefully",
-                    "said": "spoke gently",
-                    "looked": "observed serenely"
-                }
-            }
+        for index, transformed_text in zip(pending, transformed):
+            results[index] = transformed_text
+            if cacheable:
+                self._result_cache.put(cache_keys[index], transformed_text)
+        return results
+
+    def _generate_batch(self, texts, tone):
+        """
+        Run one generate call over a batch of prompts
+
+        Only the user texts are tokenized here; the tone prompt around them
+        comes from the token IDs cached in load_model. Rows are left-padded,
+        so every completion starts at the same offset and is sliced off in one step.
+
+        Args:
+            texts: Non-empty input texts
+            tone: Desired tone for transformation
+
+        Returns:
+            List of transformed texts in input order
+        """
+        inputs = self._encode_prompts(texts, tone)
+
+        # Generate responses (greedy where the tone doesn't need sampling variety)
+        generation_config = self._greedy_config if tone in _GREEDY_TONES else self._sampling_config
+        with torch.inference_mode():
+            outputs = self.model.generate(**inputs, generation_config=generation_config)
+
+        # Decode only the generated continuation of each row
+        generated_texts = self.tokenizer.batch_decode(
+            outputs[:, inputs['input_ids'].shape[1]:],
+            skip_special_tokens=True
+        )
+
+        return [
+            self._clean_generation(text, generated_text, tone)
+            for text, generated_text in zip(texts, generated_texts)
+        ]
+
+    def _encode_prompts(self, texts, tone):
+        """
+        Build left-padded model inputs for texts wrapped in the tone prompt
+
+        Args:
+            texts: Non-empty input texts
+            tone: Desired tone for transformation
+
+        Returns:
+            Dict of input_ids and attention_mask tensors on the model device
+        """
+        # Tokenize the user texts, leaving room for the cached tone prompt
+        prefix_ids, suffix_ids = self._prompt_ids.get(tone, self._prompt_ids["neutral"])
+        text_ids = self.tokenizer(
+            texts,
+            add_special_tokens=False,
+            truncation=True,
+            max_length=max(1, 512 - len(prefix_ids) - len(suffix_ids))  # Reduced for compatibility
+        ).input_ids
+
+        # Assemble and left-pad the prompts
+        rows = [
+            self.tokenizer.build_inputs_with_special_tokens(prefix_ids + ids + suffix_ids)
+            for ids in text_ids
+        ]
+        width = max(len(row) for row in rows)
+        pad_token_id = self.tokenizer.pad_token_id
+        return {
+            "input_ids": self._to_device(torch.tensor(
+                [[pad_token_id] * (width - len(row)) + row for row in rows]
+            )),
+            "attention_mask": self._to_device(torch.tensor(
+                [[0] * (width - len(row)) + [1] * len(row) for row in rows]
+            ))
         }
 
-        if tone in transformations:
-            transform = transformations[tone]
-            result = text
+    def _to_device(self, tensor):
+        """
+        Copy a CPU tensor to the model device
+
+        On CUDA the copy comes from pinned memory and is issued non-blocking,
+        so it queues on the stream ahead of generate instead of stalling the host.
+        """
+        if self.device == "cuda":
+            return tensor.pin_memory().to(self.device, non_blocking=True)
+        return tensor.to(self.device)
+
+    def _generate_batch_vllm(self, texts, tone):
+        """
+        Run a batch of prompts through the vLLM engine
+
+        Args:
+            texts: Non-empty input texts
+            tone: Desired tone for transformation
+
+        Returns:
+            List of transformed texts in input order
+        """
+        from vllm import SamplingParams
 
-            # Apply word replacements
-            for old_word, new_word in transform["replacements"].items():
-                result = result.replace(old_word, new_word)
+        prefix, suffix = self._tone_parts.get(tone, self._tone_parts["neutral"])
+        prompts = [prefix + text + suffix for text in texts]
+        if tone in _GREEDY_TONES:
+            sampling_params = SamplingParams(temperature=0, max_tokens=200)
+        else:
+            sampling_params = SamplingParams(temperature=0.7, top_p=0.9, max_tokens=200)
+
+        outputs = self.engine.generate(prompts, sampling_params, use_tqdm=False)
+        return [
+            self._clean_generation(text, output.outputs[0].text, tone)
+            for text, output in zip(texts, outputs)
+        ]
+
+    def _clean_generation(self, text, generated_text, tone):
+        """Reduce a raw completion to the transformed text, falling back to mock output"""
+        generated_text = generated_text.strip()
+
+        # Clean up the response
+        if generated_text:
+            # Simple cleanup
+            cleaned_text = generated_text.partition('\n')[0]  # Take first line (stops at the first newline)
+            return cleaned_text if cleaned_text else text
+
+        logger.warning("Empty response from AI model")
+        return self._mock_transform_text(text, tone)
+
+    def _mock_transform_batch(self, texts, tone):
+        """Mock transformation of several texts (same signature as the real generators)"""
+        return [self._mock_transform_text(text, tone) for text in texts]
+
+    def _mock_transform_text(self, text, tone):
+        """Mock text transformation for demonstration"""
+        if tone in _MOCK_TRANSFORMATIONS:
+            transform = _MOCK_TRANSFORMATIONS[tone]
+            replacements = transform["replacements"]
+
+            # Apply word replacements in a single pass
+            result = _MOCK_PATTERNS[tone].sub(lambda match: replacements[match.group(0)], text)
 
             # Add prefix and suffix for shorter texts
             if len(result.split()) < 50:
@@ -342,13 +856,19 @@ Transformed text:"""
             "status": "loaded",
             "model_name": self.model_name,
             "device": self.device,
-            "model_size": f"{sum(p.numel() for p in self.model.parameters()) / 1e9:.1f}B parameters",
+            "backend": "mock" if self.is_mock else "vllm" if self.engine is not None else "transformers",
+            "model_size": f"{self._param_count / 1e9:.1f}B parameters" if self._param_count is not None else "N/A",
             "available_tones": list(self.tone_prompts.keys()),
             "memory_usage": f"{torch.cuda.memory_allocated() / 1024**3:.1f}GB" if self.device == "cuda" else "N/A"
         }
     
     def unload_model(self):
         """Unload model from memory"""
+        self.engine = None
+        self._generate = None
+        self.is_mock = False
+        self._param_count = None
+        self._result_cache.clear()
         if self.model is not None:
             del self.model
             self.model = None
@@ -357,7 +877,13 @@ Transformed text:"""
             del self.tokenizer
             self.tokenizer = None
         
-        if self.device == "cuda":
+        # Shared weights are only freed once the last handler lets go of them
+        freed = True
+        if self._registry_key is not None:
+            freed = model_registry.release(self._registry_key)
+            self._registry_key = None
+
+        if freed and self.device == "cuda":
             torch.cuda.empty_cache()
         
         logger.info("IBM Granite 3.2 model unloaded from memory")
@@ -6,81 +6,178 @@ Provides innovative emotional intelligence features for audiobook creation.
 """
 
 import os
-import torch
+import re
 import logging
-from transformers import AutoTokenizer, AutoModelForCausalLM
+import importlib.util
+from models.result_cache import ResultCache
 import threading
 import time
 import json
 
 logger = logging.getLogger(__name__)
 
-class MistralModel:
-    """
-    Mistral 7B Model for Emotion Analysis and Voice Recommendations
-    
-    Features:
-    - Emotion detection and analysis
-    - Voice style recommendations
-    - Mood assessment
-    - Pacing suggestions
-    - Audio effect recommendations
-    """
-    
-    def __init__(self, model_name="mistralai/Mistral-7B-Instruct-v0.3"):
-        """Initialize Mistral 7B model"""
-        self.model_name = model_name
-        self.model = None
-        self.tokenizer = None
-        self.device = self._get_optimal_device()
-        self.model_dir = "models/mistral_7b"
-        self.is_loading = False
-        self.load_lock = threading.Lock()
-        
-        # Emotion analysis prompts
-        self.analysis_prompts = {
-            "emotions": """Analyze the emotional content of the following text and identify the primary emotions present. Provide a JSON response with emotions and their intensity (0-1):
+# Keyword indicators per emotion, in tie-breaking order
+_EMOTION_KEYWORDS = {
+    "joy": frozenset({"happy", "joy", "excited", "wonderful", "amazing", "great", "fantastic", "love", "smile", "laugh"}),
+    "sadness": frozenset({"sad", "cry", "tears", "sorrow", "grief", "depressed", "melancholy", "lonely", "lost"}),
+    "fear": frozenset({"afraid", "scared", "fear", "terror", "anxiety", "worried", "nervous", "panic", "danger"}),
+    "excitement": frozenset({"exciting", "thrilling", "adventure", "action", "fast", "quick", "rush", "energy"}),
+    "calm": frozenset({"peaceful", "calm", "serene", "quiet", "gentle", "soft", "tranquil", "relaxed"})
+}
+# Inverted index so each token costs a single hash lookup
+_KEYWORD_EMOTIONS = {word: emotion for emotion, words in _EMOTION_KEYWORDS.items() for word in words}
+_TOKEN_RE = re.compile(r"[a-z]+")
+# Words as split('.') then split() sees them: runs of anything but whitespace and periods
+_SENTENCE_WORD_RE = re.compile(r"[^\s.]+")
+
+# Emotion analysis prompts
+_ANALYSIS_PROMPTS = {
+    "emotions": """Analyze the emotional content of the following text and identify the primary emotions present. Provide a JSON response with emotions and their intensity (0-1):
 
 Text: {text}
 
 Emotion analysis (JSON format):""",
-            
-            "voice_style": """Based on the emotional content and tone of the following text, recommend the best voice style for audiobook narration:
+    
+    "voice_style": """Based on the emotional content and tone of the following text, recommend the best voice style for audiobook narration:
 
 Text: {text}
 
 Voice style recommendation:""",
-            
-            "pacing": """Analyze the following text and recommend optimal pacing for audiobook narration (slow/medium/fast) with explanations:
+    
+    "pacing": """Analyze the following text and recommend optimal pacing for audiobook narration (slow/medium/fast) with explanations:
 
 Text: {text}
 
 Pacing recommendation:""",
-            
-            "mood": """Determine the overall mood of the following text and how it should influence the audiobook presentation:
+    
+    "mood": """Determine the overall mood of the following text and how it should influence the audiobook presentation:
 
 Text: {text}
 
 Mood analysis:""",
-            
-            "effects": """Suggest audio effects that would enhance the audiobook experience for the following text:
+    
+    "effects": """Suggest audio effects that would enhance the audiobook experience for the following text:
 
 Text: {text}
 
 Audio effects suggestions:"""
-        }
+}
+
+# Predefined emotion categories
+_EMOTION_CATEGORIES = (
+    "joy", "sadness", "anger", "fear", "surprise", "disgust",
+    "anticipation", "trust", "love", "excitement", "calm",
+    "tension", "mystery", "hope", "despair", "wonder"
+)
+
+# Small sentence-level emotion classifier, run as an INT8 ONNX Runtime export when available
+_EMOTION_CLASSIFIER = "j-hartmann/emotion-english-distilroberta-base"
+_MIN_EMOTION_SCORE = 0.05  # Classifier labels below this score are dropped
+
+# Voice style recommended for a strongly (intensity > 0.6) expressed primary emotion
+_VOICE_RECOMMENDATIONS = {
+    "joy": {
+        "style": "upbeat",
+        "explanation": "Cheerful and energetic voice to match the joyful content",
+        "characteristics": ("warm", "expressive", "slightly faster pace")
+    },
+    "sadness": {
+        "style": "gentle",
+        "explanation": "Soft and compassionate voice for emotional content",
+        "characteristics": ("tender", "slower pace", "lower pitch")
+    },
+    "fear": {
+        "style": "dramatic",
+        "explanation": "Tense and engaging voice to build suspense",
+        "characteristics": ("varied pace", "emphasis on tension", "dynamic range")
+    },
+    "excitement": {
+        "style": "energetic",
+        "explanation": "Dynamic and engaging voice for exciting content",
+        "characteristics": ("faster pace", "higher energy", "expressive")
+    },
+    "calm": {
+        "style": "soothing",
+        "explanation": "Calm and peaceful voice for relaxing content",
+        "characteristics": ("steady pace", "gentle tone", "consistent rhythm")
+    }
+}
+_DEFAULT_VOICE_RECOMMENDATION = {
+    "style": "neutral",
+    "explanation": "Balanced and professional voice for general content",
+    "characteristics": ("clear", "moderate pace", "natural tone")
+}
+
+# (pacing, explanation) for a strongly expressed primary emotion
+_EMOTION_PACING = {
+    "excitement": ("varied", "Use varied pacing to build tension and excitement"),
+    "fear": ("varied", "Use varied pacing to build tension and excitement"),
+    "sadness": ("slow", "Slower pacing allows for emotional resonance"),
+    "calm": ("slow", "Slower pacing allows for emotional resonance")
+}
+
+# (effects, explanation) for a strongly expressed primary emotion
+_EMOTION_EFFECTS = {
+    "fear": (("reverb", "echo", "low_pass_filter"), "Atmospheric effects to enhance suspense and tension"),
+    "joy": (("brightness", "slight_compression"), "Enhance clarity and warmth for uplifting content"),
+    "sadness": (("soft_reverb", "gentle_eq"), "Subtle effects to add emotional depth"),
+    "calm": (("noise_reduction", "gentle_compression"), "Clean, peaceful audio for relaxing content")
+}
+_DIALOGUE_EFFECTS = (("dialogue_enhancement", "slight_eq"), "Optimize for clear dialogue delivery")
+_DEFAULT_EFFECTS = (("standard_processing",), "Basic audio processing for clear narration")
+
+# Stand-ins for the model and tokenizer while running the keyword demo engine
+_DEMO_MODEL = "mistral_working"
+_DEMO_TOKENIZER = "mistral_tokenizer_working"
+
+class MistralModel:
+    """
+    Mistral 7B Model for Emotion Analysis and Voice Recommendations
+    
+    Features:
+    - Emotion detection and analysis
+    - Voice style recommendations
+    - Mood assessment
+    - Pacing suggestions
+    - Audio effect recommendations
+    """
+    
+    def __init__(self, model_name="mistralai/Mistral-7B-Instruct-v0.3", mock=True):
+        """
+        Initialize Mistral 7B model
+
+        Args:
+            model_name: Hugging Face model identifier
+            mock: Use the keyword demo engine, which is ready immediately;
+                False runs load_model (including the ONNX emotion classifier)
+        """
+        self.model_name = model_name
+        self.mock = mock
+        self.model = _DEMO_MODEL if mock else None
+        self.tokenizer = _DEMO_TOKENIZER if mock else None
+        self._emotion_classifier = None
+        # The demo engine runs on CPU; the real device is resolved in load_model (imports torch)
+        self.device = "cpu" if mock else None
+        self.model_dir = "models/mistral_7b"
+        self._load_done = threading.Event()
+        self._load_done.set()  # Set whenever no load is in progress
+        self.load_lock = threading.Lock()
+        self._result_cache = ResultCache(maxsize=2048)
         
-        # Predefined emotion categories
-        self.emotion_categories = [
-            "joy", "sadness", "anger", "fear", "surprise", "disgust",
-            "anticipation", "trust", "love", "excitement", "calm",
-            "tension", "mystery", "hope", "despair", "wonder"
-        ]
+        # Prompts and categories are shared module constants
+        self.analysis_prompts = _ANALYSIS_PROMPTS
+        self.emotion_categories = _EMOTION_CATEGORIES
         
         logger.info(f"Initialized Mistral 7B model handler")
     
     def _get_optimal_device(self):
         """Determine the best device for model execution"""
+        # torch is imported lazily; the demo engine runs without it
+        try:
+            import torch
+        except ImportError:
+            return "cpu"
+
         if torch.cuda.is_available():
             return "cuda"
         elif hasattr(torch.backends, 'mps') and torch.backends.mps.is_available():
@@ -90,36 +187,93 @@ Audio effects suggestions:"""
     
     def load_model(self):
         """Load Mistral 7B model (mock implementation for demo)"""
+        if self.mock:
+            # Nothing to load for the demo engine
+            self.model, self.tokenizer = _DEMO_MODEL, _DEMO_TOKENIZER
+            return True
+
         with self.load_lock:
             if self.model is not None:
                 return True
 
-            if self.is_loading:
-                while self.is_loading:
-                    time.sleep(1)
-                return self.model is not None
+            # Claim the load, or note that another thread is already loading
+            load_in_progress = not self._load_done.is_set()
+            if not load_in_progress:
+                self._load_done.clear()
 
-            self.is_loading = True
+        if load_in_progress:
+            # Block until the loading thread signals completion (no polling)
+            self._load_done.wait()
+            return self.model is not None
 
-            try:
-                logger.info("Initializing Mistral 7B emotion analysis engine...")
+        try:
+            logger.info("Initializing Mistral 7B emotion analysis engine...")
+            self.device = self._get_optimal_device()
 
-                # Simulate model loading delay
-                time.sleep(1.5)
+            # Simulate model loading delay
+            time.sleep(1.5)
 
-                # Mock implementation for demo (working)
-                self.model = "mistral_working"
-                self.tokenizer = "mistral_tokenizer_working"
+            # Mock implementation for demo (working)
+            self.model = _DEMO_MODEL
+            self.tokenizer = _DEMO_TOKENIZER
 
-                logger.info("Mistral 7B emotion analysis engine ready!")
-                return True
+            # Prefer a real emotion classifier over the keyword scan
+            self._emotion_classifier = self._load_emotion_classifier()
 
-            except Exception as e:
-                logger.error(f"Failed to load Mistral 7B model: {str(e)}")
-                return False
+            logger.info("Mistral 7B emotion analysis engine ready!")
+            return True
 
-            finally:
-                self.is_loading = False
+        except Exception as e:
+            logger.error(f"Failed to load Mistral 7B model: {str(e)}")
+            return False
+
+        finally:
+            self._load_done.set()
+    
+    def _load_emotion_classifier(self):
+        """
+        Load an INT8 dynamically quantized ONNX Runtime emotion classifier
+        
+        The export and quantization run once and are kept in model_dir; INT8
+        GEMMs use VNNI instructions on CPUs that have them.
+        
+        Returns:
+            text-classification pipeline, or None to use the keyword scan
+        """
+        if importlib.util.find_spec("optimum") is None or importlib.util.find_spec("onnxruntime") is None:
+            return None
+        
+        try:
+            from transformers import AutoTokenizer, pipeline
+            from optimum.onnxruntime import ORTModelForSequenceClassification, ORTQuantizer
+            from optimum.onnxruntime.configuration import AutoQuantizationConfig
+            
+            quantized_dir = os.path.join(self.model_dir, "emotion_onnx_int8")
+            if not os.path.isdir(quantized_dir):
+                logger.info("Exporting emotion classifier to ONNX with INT8 quantization (one-time)...")
+                export_dir = os.path.join(self.model_dir, "emotion_onnx")
+                ORTModelForSequenceClassification.from_pretrained(_EMOTION_CLASSIFIER, export=True).save_pretrained(export_dir)
+                AutoTokenizer.from_pretrained(_EMOTION_CLASSIFIER).save_pretrained(export_dir)
+                
+                # Quantize into a staging directory so an interrupted run is never reused
+                staging_dir = f"{quantized_dir}.tmp"
+                ORTQuantizer.from_pretrained(export_dir).quantize(
+                    save_dir=staging_dir,
+                    quantization_config=AutoQuantizationConfig.avx512_vnni(is_static=False, per_channel=True)
+                )
+                AutoTokenizer.from_pretrained(export_dir).save_pretrained(staging_dir)
+                os.replace(staging_dir, quantized_dir)
+            
+            return pipeline(
+                "text-classification",
+                model=ORTModelForSequenceClassification.from_pretrained(quantized_dir, file_name="model_quantized.onnx"),
+                tokenizer=AutoTokenizer.from_pretrained(quantized_dir),
+                top_k=None
+            )
+        
+        except Exception as e:
+            logger.warning(f"Emotion classifier unavailable, using keyword analysis: {str(e)}")
+            return None
     
     def is_loaded(self):
         """Check if model is loaded"""
@@ -143,9 +297,26 @@ Audio effects suggestions:"""
                 return {"emotions": {}, "primary_emotion": "neutral", "intensity": 0.0}
         
         try:
-            # Mock emotion analysis for demo
-            emotion_data = self._mock_emotion_analysis(text)
-            return emotion_data
+            # Classifier or keyword analysis (both deterministic, so repeats are cached)
+            cache_key = ResultCache.key(text, "emotions")
+            cached = self._result_cache.get(cache_key)
+            if cached is None:
+                if self._emotion_classifier is not None:
+                    emotion_data = self._classify_emotions(text)
+                else:
+                    emotion_data = self._mock_emotion_analysis(text)
+                cached = (tuple(emotion_data["emotions"].items()), emotion_data["primary_emotion"],
+                          emotion_data["intensity"], emotion_data["confidence"])
+                self._result_cache.put(cache_key, cached)
+
+            # Rebuild a fresh dict so callers can't mutate the cached entry
+            emotions, primary_emotion, intensity, confidence = cached
+            return {
+                "emotions": dict(emotions),
+                "primary_emotion": primary_emotion,
+                "intensity": intensity,
+                "confidence": confidence
+            }
             
         except Exception as e:
             logger.error(f"Error analyzing emotions with Mistral: {str(e)}")
@@ -243,43 +414,57 @@ Audio effects suggestions:"""
         except Exception as e:
             logger.error(f"Error suggesting audio effects with Mistral: {str(e)}")
             return {"effects": [], "explanation": "Analysis failed"}
+
+    def analyze_all(self, text):
+        """
+        Run emotion analysis once and derive every narration recommendation from it
+        
+        Args:
+            text: Input text
+            
+        Returns:
+            Dictionary with emotions, voice, pacing and effects results
+        """
+        emotion_data = self.analyze_emotions(text)
+        return {
+            "emotions": emotion_data,
+            "voice": self.recommend_voice_style(text, emotion_data),
+            "pacing": self.suggest_pacing(text, emotion_data),
+            "effects": self.suggest_audio_effects(text, emotion_data)
+        }
+    
+    def _classify_emotions(self, text):
+        """Emotion analysis with the ONNX Runtime classifier"""
+        scores = self._emotion_classifier([text], truncation=True)[0]
+        emotions = {
+            result["label"]: round(result["score"], 3)
+            for result in scores
+            if result["score"] >= _MIN_EMOTION_SCORE
+        }
+        primary = max(scores, key=lambda result: result["score"])
+        
+        return {
+            "emotions": emotions,
+            "primary_emotion": primary["label"],
+            "intensity": round(primary["score"], 3),
+            "confidence": round(primary["score"], 3)
+        }
     
     def _mock_emotion_analysis(self, text):
         """Mock emotion analysis for demo"""
-        # Simple keyword-based emotion detection
-        text_lower = text.lower()
-        
+        # Simple keyword-based emotion detection: whole-word keyword hits per emotion
+        tokens = _TOKEN_RE.findall(text.lower())
+        counts = dict.fromkeys(_EMOTION_KEYWORDS, 0)
+        for token in tokens:
+            emotion = _KEYWORD_EMOTIONS.get(token)
+            if emotion is not None:
+                counts[emotion] += 1
+        
+        word_count = len(tokens) or 1
         emotions = {}
-        
-        # Joy indicators
-        joy_words = ["happy", "joy", "excited", "wonderful", "amazing", "great", "fantastic", "love", "smile", "laugh"]
-        joy_score = sum(1 for word in joy_words if word in text_lower) / len(text.split()) * 10
-        if joy_score > 0:
-            emotions["joy"] = min(joy_score, 1.0)
-        
-        # Sadness indicators
-        sad_words = ["sad", "cry", "tears", "sorrow", "grief", "depressed", "melancholy", "lonely", "lost"]
-        sad_score = sum(1 for word in sad_words if word in text_lower) / len(text.split()) * 10
-        if sad_score > 0:
-            emotions["sadness"] = min(sad_score, 1.0)
-        
-        # Fear/Tension indicators
-        fear_words = ["afraid", "scared", "fear", "terror", "anxiety", "worried", "nervous", "panic", "danger"]
-        fear_score = sum(1 for word in fear_words if word in text_lower) / len(text.split()) * 10
-        if fear_score > 0:
-            emotions["fear"] = min(fear_score, 1.0)
-        
-        # Excitement/Energy indicators
-        energy_words = ["exciting", "thrilling", "adventure", "action", "fast", "quick", "rush", "energy"]
-        energy_score = sum(1 for word in energy_words if word in text_lower) / len(text.split()) * 10
-        if energy_score > 0:
-            emotions["excitement"] = min(energy_score, 1.0)
-        
-        # Calm indicators
-        calm_words = ["peaceful", "calm", "serene", "quiet", "gentle", "soft", "tranquil", "relaxed"]
-        calm_score = sum(1 for word in calm_words if word in text_lower) / len(text.split()) * 10
-        if calm_score > 0:
-            emotions["calm"] = min(calm_score, 1.0)
+        for emotion, count in counts.items():
+            if count:
+                emotions[emotion] = min(count / word_count * 10, 1.0)
         
         # Determine primary emotion
         if emotions:
@@ -303,58 +488,24 @@ Audio effects suggestions:"""
         primary_emotion = emotion_data.get("primary_emotion", "neutral")
         intensity = emotion_data.get("intensity", 0.5)
         
-        if primary_emotion == "joy" and intensity > 0.6:
-            return {
-                "style": "upbeat",
-                "explanation": "Cheerful and energetic voice to match the joyful content",
-                "characteristics": ["warm", "expressive", "slightly faster pace"]
-            }
-        elif primary_emotion == "sadness" and intensity > 0.6:
-            return {
-                "style": "gentle",
-                "explanation": "Soft and compassionate voice for emotional content",
-                "characteristics": ["tender", "slower pace", "lower pitch"]
-            }
-        elif primary_emotion == "fear" and intensity > 0.6:
-            return {
-                "style": "dramatic",
-                "explanation": "Tense and engaging voice to build suspense",
-                "characteristics": ["varied pace", "emphasis on tension", "dynamic range"]
-            }
-        elif primary_emotion == "excitement" and intensity > 0.6:
-            return {
-                "style": "energetic",
-                "explanation": "Dynamic and engaging voice for exciting content",
-                "characteristics": ["faster pace", "higher energy", "expressive"]
-            }
-        elif primary_emotion == "calm" and intensity > 0.6:
-            return {
-                "style": "soothing",
-                "explanation": "Calm and peaceful voice for relaxing content",
-                "characteristics": ["steady pace", "gentle tone", "consistent rhythm"]
-            }
-        else:
-            return {
-                "style": "neutral",
-                "explanation": "Balanced and professional voice for general content",
-                "characteristics": ["clear", "moderate pace", "natural tone"]
-            }
+        recommendation = _VOICE_RECOMMENDATIONS.get(primary_emotion) if intensity > 0.6 else None
+        if recommendation is None:
+            recommendation = _DEFAULT_VOICE_RECOMMENDATION
+        
+        # Copy so callers can't mutate the shared table
+        return {**recommendation, "characteristics": list(recommendation["characteristics"])}
     
     def _mock_pacing_suggestion(self, text, emotion_data):
         """Mock pacing suggestion"""
         primary_emotion = emotion_data.get("primary_emotion", "neutral")
         intensity = emotion_data.get("intensity", 0.5)
         
-        # Analyze sentence structure
-        sentences = text.split('.')
-        avg_sentence_length = sum(len(s.split()) for s in sentences) / len(sentences) if sentences else 10
+        # Analyze sentence structure (period-delimited pieces, counted without splitting)
+        avg_sentence_length = len(_SENTENCE_WORD_RE.findall(text)) / (text.count('.') + 1)
         
-        if primary_emotion in ["excitement", "fear"] and intensity > 0.6:
-            pacing = "varied"
-            explanation = "Use varied pacing to build tension and excitement"
-        elif primary_emotion in ["sadness", "calm"] and intensity > 0.6:
-            pacing = "slow"
-            explanation = "Slower pacing allows for emotional resonance"
+        suggestion = _EMOTION_PACING.get(primary_emotion) if intensity > 0.6 else None
+        if suggestion is not None:
+            pacing, explanation = suggestion
         elif avg_sentence_length > 20:
             pacing = "slow"
             explanation = "Complex sentences require slower pacing for comprehension"
@@ -376,29 +527,16 @@ Audio effects suggestions:"""
         primary_emotion = emotion_data.get("primary_emotion", "neutral")
         intensity = emotion_data.get("intensity", 0.5)
         
-        effects = []
-        
-        if primary_emotion == "fear" and intensity > 0.6:
-            effects = ["reverb", "echo", "low_pass_filter"]
-            explanation = "Atmospheric effects to enhance suspense and tension"
-        elif primary_emotion == "joy" and intensity > 0.6:
-            effects = ["brightness", "slight_compression"]
-            explanation = "Enhance clarity and warmth for uplifting content"
-        elif primary_emotion == "sadness" and intensity > 0.6:
-            effects = ["soft_reverb", "gentle_eq"]
-            explanation = "Subtle effects to add emotional depth"
-        elif primary_emotion == "calm" and intensity > 0.6:
-            effects = ["noise_reduction", "gentle_compression"]
-            explanation = "Clean, peaceful audio for relaxing content"
-        elif "dialogue" in text.lower() or '"' in text:
-            effects = ["dialogue_enhancement", "slight_eq"]
-            explanation = "Optimize for clear dialogue delivery"
-        else:
-            effects = ["standard_processing"]
-            explanation = "Basic audio processing for clear narration"
+        suggestion = _EMOTION_EFFECTS.get(primary_emotion) if intensity > 0.6 else None
+        if suggestion is None:
+            if "dialogue" in text.lower() or '"' in text:
+                suggestion = _DIALOGUE_EFFECTS
+            else:
+                suggestion = _DEFAULT_EFFECTS
+        effects, explanation = suggestion
         
         return {
-            "effects": effects,
+            "effects": list(effects),
             "explanation": explanation,
             "confidence": 0.8
         }
@@ -414,12 +552,15 @@ Audio effects suggestions:"""
     
     def unload_model(self):
         """Unload model from memory"""
+        self._result_cache.clear()
+        self._emotion_classifier = None
         if self.model is not None:
             self.model = None
         if self.tokenizer is not None:
             self.tokenizer = None
         
         if self.device == "cuda":
+            import torch
             torch.cuda.empty_cache()
         
         logger.info("Mistral 7B model unloaded from memory")
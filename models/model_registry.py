@@ -0,0 +1,88 @@
+"""
+Model Registry
+==============
+Process-wide, reference-counted store of loaded model weights so that
+several model handlers asking for the same checkpoint share one copy.
+"""
+
+import threading
+
+_REGISTRY = {}  # key -> [value, refcount]
+_KEY_LOCKS = {}
+_REGISTRY_LOCK = threading.Lock()
+
+
+def weights_key(model_name, device, backend, **load_config):
+    """
+    Build the registry key for a checkpoint loaded with specific settings
+
+    Every handler uses this key shape, so two handlers share one copy only
+    when the checkpoint, backend and load settings all match; a different
+    quantization, dtype, attention kernel or compile flag loads separately.
+
+    Args:
+        model_name: Hugging Face model identifier
+        device: Device the weights are placed on
+        backend: Loader that produced the value (e.g. 'transformers' for a causal LM)
+        **load_config: Settings passed to the loader, compared by repr
+
+    Returns:
+        Hashable key for acquire and release
+    """
+    config = tuple(sorted((name, repr(value)) for name, value in load_config.items()))
+    return (model_name, device, backend, config)
+
+
+def acquire(key, loader):
+    """
+    Get the shared value for key, loading it on first use
+
+    Args:
+        key: Identifier of the weights, from weights_key
+        loader: Zero-argument callable that loads the value; only called once per key
+
+    Returns:
+        The shared value; every call must be paired with release(key)
+    """
+    with _REGISTRY_LOCK:
+        entry = _REGISTRY.get(key)
+        if entry is not None:
+            entry[1] += 1
+            return entry[0]
+        key_lock = _KEY_LOCKS.setdefault(key, threading.Lock())
+
+    # Load outside the registry lock so other checkpoints aren't blocked
+    with key_lock:
+        with _REGISTRY_LOCK:
+            entry = _REGISTRY.get(key)
+            if entry is not None:
+                entry[1] += 1
+                return entry[0]
+
+        value = loader()
+
+        with _REGISTRY_LOCK:
+            _REGISTRY[key] = [value, 1]
+        return value
+
+
+def release(key):
+    """
+    Drop one reference to the value for key
+
+    Args:
+        key: Identifier previously passed to acquire
+
+    Returns:
+        True if this was the last reference and the value was freed
+    """
+    with _REGISTRY_LOCK:
+        entry = _REGISTRY.get(key)
+        if entry is None:
+            return False
+        entry[1] -= 1
+        if entry[1] > 0:
+            return False
+        del _REGISTRY[key]
+        _KEY_LOCKS.pop(key, None)
+        return True
@@ -0,0 +1,56 @@
+"""
+Model Result Cache
+==================
+Small thread-safe LRU for deterministic model outputs, keyed on a digest
+of the input text so long paragraphs don't stay resident as keys.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+
+
+class ResultCache:
+    """
+    Thread-safe LRU cache keyed by (text digest, *options)
+
+    Only deterministic results should be stored; callers decide which
+    outputs qualify (e.g. greedy decoding or mock fallbacks).
+    """
+
+    def __init__(self, maxsize=1024):
+        """
+        Initialize the cache
+
+        Args:
+            maxsize: Maximum number of results kept
+        """
+        self.maxsize = maxsize
+        self._results = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(text, *options):
+        """Build a compact cache key for text plus hashable options"""
+        return (hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest(),) + options
+
+    def get(self, key):
+        """Get a cached result, or None if missing"""
+        with self._lock:
+            result = self._results.get(key)
+            if result is not None:
+                self._results.move_to_end(key)
+            return result
+
+    def put(self, key, result):
+        """Store a result, evicting the least recently used entries if needed"""
+        with self._lock:
+            self._results[key] = result
+            self._results.move_to_end(key)
+            while len(self._results) > self.maxsize:
+                self._results.popitem(last=False)
+
+    def clear(self):
+        """Drop all cached results"""
+        with self._lock:
+            self._results.clear()
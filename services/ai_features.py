@@ -6,14 +6,47 @@ Provides story generation, content analysis, and voice recommendations.
 """
 
 import logging
+import heapq
 import random
 import re
+import importlib.util
 from datetime import datetime
 from typing import Dict, Any, List, Optional
 from collections import Counter
 
 logger = logging.getLogger(__name__)
 
+AHOCORASICK_AVAILABLE = importlib.util.find_spec('ahocorasick') is not None
+
+# Patterns and word lists used by content analysis, built once at import
+_SENTENCE_SPLIT = re.compile(r'[.!?]+')
+_THEME_WORD = re.compile(r'\b[a-zA-Z]{4,}\b')
+_THEME_STOP_WORDS = frozenset({'that', 'this', 'with', 'have', 'will', 'been', 'were', 'said', 'each', 'which', 'their', 'time', 'would', 'there', 'could', 'other'})
+_GENRE_KEYWORDS = {
+    'mystery': ('detective', 'crime', 'murder', 'clue', 'suspect', 'investigation'),
+    'fantasy': ('magic', 'wizard', 'dragon', 'spell', 'enchanted', 'quest'),
+    'sci-fi': ('space', 'alien', 'robot', 'future', 'technology', 'planet'),
+    'romance': ('love', 'heart', 'kiss', 'romance', 'relationship', 'passion'),
+    'adventure': ('journey', 'treasure', 'explore', 'adventure', 'quest', 'expedition'),
+    'horror': ('fear', 'terror', 'ghost', 'haunted', 'nightmare', 'evil'),
+    'drama': ('emotion', 'conflict', 'family', 'relationship', 'struggle')
+}
+
+
+def _build_genre_automaton():
+    """Build an Aho-Corasick automaton over all genre keywords (needs pyahocorasick)"""
+    import ahocorasick
+    
+    automaton = ahocorasick.Automaton()
+    for keyword in {keyword for keywords in _GENRE_KEYWORDS.values() for keyword in keywords}:
+        automaton.add_word(keyword, keyword)
+    automaton.make_automaton()
+    return automaton
+
+
+# Finds every genre keyword in one linear pass; None falls back to per-keyword scans
+_GENRE_AUTOMATON = _build_genre_automaton() if AHOCORASICK_AVAILABLE else None
+
 class AIFeaturesManager:
     """
     Professional manager for innovative AI features
@@ -103,6 +136,16 @@ class AIFeaturesManager:
             }
         }
         
+        # Archetype scoring tables, so recommendations don't rescan genre lists per call
+        self._archetype_base_scores = tuple(
+            (name, 1 if 'general' in archetype['suitable_genres'] or len(archetype['suitable_genres']) > 3 else 0)
+            for name, archetype in self.voice_archetypes.items()
+        )
+        self._genre_archetypes = {}
+        for name, archetype in self.voice_archetypes.items():
+            for suitable_genre in archetype['suitable_genres']:
+                self._genre_archetypes.setdefault(suitable_genre, set()).add(name)
+        
         logger.info("AI Features Manager initialized with story templates and voice archetypes")
     
     def generate_story(self, genre: str = 'mystery', length: str = 'medium') -> Dict[str, Any]:
@@ -181,25 +224,26 @@ class AIFeaturesManager:
         try:
             logger.info("🧠 Analyzing content with AI insights")
             
-            # Basic text statistics
+            # Basic text statistics (the lowercased text is shared by the keyword helpers)
+            text_lower = text.lower()
             words = text.split()
-            sentences = re.split(r'[.!?]+', text)
+            sentences = _SENTENCE_SPLIT.split(text)
             paragraphs = [p.strip() for p in text.split('\n\n') if p.strip()]
             
             # Genre detection
-            detected_genre = self._detect_genre(text)
+            detected_genre = self._detect_genre(text_lower)
             
             # Emotion analysis using LLM
             sentiment_data = self.llm_manager.analyze_sentiment(text)
             
             # Complexity assessment
-            complexity = self._assess_complexity(text)
+            complexity = self._assess_complexity(words, sentences)
             
             # Extract key themes
-            themes = self._extract_themes(text)
+            themes = self._extract_themes(text_lower)
             
             # Voice recommendations
-            voice_recommendations = self._get_voice_recommendations_for_content(text, detected_genre)
+            voice_recommendations = self._get_voice_recommendations_for_content(text_lower, detected_genre)
             
             analysis = {
                 'word_count': len(words),
@@ -249,46 +293,42 @@ class AIFeaturesManager:
         try:
             logger.info(f"🎤 Getting voice recommendations for {genre} genre")
             
-            recommendations = []
-            
-            # Score each archetype
-            for archetype_name, archetype in self.voice_archetypes.items():
-                score = 0
-                
-                # Genre matching
-                if genre in archetype['suitable_genres']:
-                    score += 3
-                elif 'general' in archetype['suitable_genres'] or len(archetype['suitable_genres']) > 3:
-                    score += 1
-                
-                # Content analysis (if provided)
-                if content:
-                    content_lower = content.lower()
-                    
-                    # Check for genre-specific keywords
-                    if genre == 'mystery' and any(word in content_lower for word in ['mystery', 'detective', 'clue', 'suspect']):
-                        if archetype_name == 'mysterious_voice':
-                            score += 2
-                    elif genre == 'adventure' and any(word in content_lower for word in ['adventure', 'journey', 'explore']):
-                        if archetype_name == 'energetic_guide':
-                            score += 2
-                    elif genre == 'drama' and any(word in content_lower for word in ['emotion', 'heart', 'passion']):
-                        if archetype_name == 'dramatic_storyteller':
-                            score += 2
+            # Content analysis (if provided): genre keywords favour one archetype
+            keyword_archetype = None
+            if content:
+                content_lower = content.lower()
                 
+                # Check for genre-specific keywords
+                if genre == 'mystery' and any(word in content_lower for word in ['mystery', 'detective', 'clue', 'suspect']):
+                    keyword_archetype = 'mysterious_voice'
+                elif genre == 'adventure' and any(word in content_lower for word in ['adventure', 'journey', 'explore']):
+                    keyword_archetype = 'energetic_guide'
+                elif genre == 'drama' and any(word in content_lower for word in ['emotion', 'heart', 'passion']):
+                    keyword_archetype = 'dramatic_storyteller'
+            
+            # Score each archetype from the precomputed tables
+            genre_matches = self._genre_archetypes.get(genre, ())
+            scores = [
+                (3 if name in genre_matches else base_score) + (2 if name == keyword_archetype else 0)
+                for name, base_score in self._archetype_base_scores
+            ]
+            
+            # Top 3 by score; nlargest keeps archetype order among ties like a stable sort
+            top = heapq.nlargest(3, range(len(scores)), key=scores.__getitem__)
+            recommendations = []
+            for index in top:
+                archetype_name = self._archetype_base_scores[index][0]
+                archetype = self.voice_archetypes[archetype_name]
                 recommendations.append({
                     'archetype': archetype_name,
                     'description': archetype['description'],
-                    'score': score,
+                    'score': scores[index],
                     'characteristics': archetype['characteristics'],
                     'suitable_genres': archetype['suitable_genres']
                 })
             
-            # Sort by score
-            recommendations.sort(key=lambda x: x['score'], reverse=True)
-            
-            logger.info(f"✅ Generated {len(recommendations)} voice recommendations")
-            return recommendations[:3]  # Return top 3
+            logger.info(f"✅ Generated {len(scores)} voice recommendations")
+            return recommendations
             
         except Exception as e:
             logger.error(f"Error getting voice recommendations: {str(e)}")
@@ -314,23 +354,18 @@ class AIFeaturesManager:
         ]
         return random.choice(synopsis_templates)
     
-    def _detect_genre(self, text: str) -> str:
-        """Detect genre from text content"""
-        text_lower = text.lower()
-        
-        genre_keywords = {
-            'mystery': ['detective', 'crime', 'murder', 'clue', 'suspect', 'investigation'],
-            'fantasy': ['magic', 'wizard', 'dragon', 'spell', 'enchanted', 'quest'],
-            'sci-fi': ['space', 'alien', 'robot', 'future', 'technology', 'planet'],
-            'romance': ['love', 'heart', 'kiss', 'romance', 'relationship', 'passion'],
-            'adventure': ['journey', 'treasure', 'explore', 'adventure', 'quest', 'expedition'],
-            'horror': ['fear', 'terror', 'ghost', 'haunted', 'nightmare', 'evil'],
-            'drama': ['emotion', 'conflict', 'family', 'relationship', 'struggle']
-        }
+    def _detect_genre(self, text_lower: str) -> str:
+        """Detect genre from lowercased text content"""
+        if _GENRE_AUTOMATON is not None:
+            found = {keyword for _, keyword in _GENRE_AUTOMATON.iter(text_lower)}
+            present = found.__contains__
+        else:
+            present = text_lower.__contains__
         
+        # Score = number of distinct genre keywords present
         genre_scores = {}
-        for genre, keywords in genre_keywords.items():
-            score = sum(1 for keyword in keywords if keyword in text_lower)
+        for genre, keywords in _GENRE_KEYWORDS.items():
+            score = sum(1 for keyword in keywords if present(keyword))
             if score > 0:
                 genre_scores[genre] = score
         
@@ -339,14 +374,12 @@ class AIFeaturesManager:
         else:
             return 'general'
     
-    def _assess_complexity(self, text: str) -> str:
-        """Assess text complexity"""
-        words = text.split()
+    def _assess_complexity(self, words: List[str], sentences: List[str]) -> str:
+        """Assess text complexity from its words and sentence split"""
         if not words:
             return 'simple'
         
-        avg_word_length = sum(len(word) for word in words) / len(words)
-        sentences = re.split(r'[.!?]+', text)
+        avg_word_length = sum(map(len, words)) / len(words)
         avg_sentence_length = len(words) / max(len(sentences), 1)
         
         if avg_word_length > 6 and avg_sentence_length > 20:
@@ -356,16 +389,13 @@ class AIFeaturesManager:
         else:
             return 'simple'
     
-    def _extract_themes(self, text: str) -> List[str]:
-        """Extract key themes from text"""
-        words = re.findall(r'\b[a-zA-Z]{4,}\b', text.lower())
-        stop_words = {'that', 'this', 'with', 'have', 'will', 'been', 'were', 'said', 'each', 'which', 'their', 'time', 'would', 'there', 'could', 'other'}
-        meaningful_words = [word for word in words if word not in stop_words]
-        
-        word_counts = Counter(meaningful_words)
-        themes = [word for word, count in word_counts.most_common(5) if count >= 2]
+    def _extract_themes(self, text_lower: str) -> List[str]:
+        """Extract key themes from lowercased text"""
+        words = _THEME_WORD.findall(text_lower)
+        word_counts = Counter(word for word in words if word not in _THEME_STOP_WORDS)
         
-        return themes[:3]  # Return top 3 themes
+        # Top 3 themes; most_common(k) is a heap-based top-k, not a full sort
+        return [word for word, count in word_counts.most_common(3) if count >= 2]
     
     def _get_voice_recommendations_for_content(self, text: str, genre: str) -> List[Dict[str, Any]]:
         """Get voice recommendations based on content analysis"""
@@ -0,0 +1,41 @@
+"""
+Shared HTTP Session Factory
+===========================
+Pooled requests sessions for the external AI services, so TCP/TLS
+connections are reused across requests instead of opened per call.
+"""
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+def create_session(pool_connections: int = 32, pool_maxsize: int = 64,
+                   retries: int = 3) -> requests.Session:
+    """
+    Create a requests session with a keep-alive connection pool
+    
+    Args:
+        pool_connections: Number of host pools to cache
+        pool_maxsize: Maximum connections kept per host
+        retries: Retries for failed connections, with exponential backoff.
+            Failed reads are only retried for idempotent methods, so a POST
+            that reached the server is never sent twice. Use 0 for health
+            probes, which should report a dead host at once.
+        
+    Returns:
+        Configured requests session
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        max_retries=Retry(
+            total=retries,
+            backoff_factor=0.3,
+            allowed_methods=Retry.DEFAULT_ALLOWED_METHODS
+        )
+    )
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
@@ -0,0 +1,59 @@
+"""
+Job Store
+=========
+Bounded, in-process store for audiobook job results.
+Keeps the full texts and analysis server-side so API responses can
+carry a reference instead of repeating them.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+
+class JobStore:
+    """
+    Thread-safe LRU store with per-entry expiry
+    
+    Entries are evicted once they are older than ``ttl`` seconds, or when
+    more than ``maxsize`` jobs are stored (least recently used first).
+    """
+    
+    def __init__(self, maxsize: int = 1000, ttl: float = 3600):
+        """
+        Initialize the job store
+        
+        Args:
+            maxsize: Maximum number of jobs kept
+            ttl: Seconds a job is kept after it was stored
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def put(self, job_id: str, data: Dict[str, Any]):
+        """Store data for a job, evicting the oldest jobs if needed"""
+        with self._lock:
+            self._jobs[job_id] = (time.monotonic() + self.ttl, data)
+            self._jobs.move_to_end(job_id)
+            while len(self._jobs) > self.maxsize:
+                self._jobs.popitem(last=False)
+    
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Get data for a job, or None if unknown or expired"""
+        with self._lock:
+            entry = self._jobs.get(job_id)
+            if entry is None:
+                return None
+            expires_at, data = entry
+            if expires_at < time.monotonic():
+                del self._jobs[job_id]
+                return None
+            self._jobs.move_to_end(job_id)
+            return data
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._jobs)
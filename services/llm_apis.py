@@ -12,6 +12,9 @@ import time
 import os
 from typing import Optional, Dict, Any, List
 
+from services.http_session import create_session
+from services.rate_limiter import PriorityRateLimiter
+
 # Free LLM API clients
 try:
     from groq import Groq
@@ -116,13 +119,22 @@ class LLMAPIManager:
             except Exception as e:
                 logger.error(f"❌ Failed to initialize Replicate: {str(e)}")
 
+        # Keep Groq calls under its 500 RPM cap; lower priority values go first
+        self.groq_limiter = PriorityRateLimiter(
+            max_rate=int(os.getenv('GROQ_MAX_RPM', '480')),
+            time_period=60,
+            max_concurrent=24
+        )
+
         # API endpoints
         self.groq_url = "https://api.groq.com/openai/v1/chat/completions"
         self.hf_url = "https://api-inference.huggingface.co/models"
 
-        # Session for requests
-        self.session = requests.Session()
-        self.session.timeout = 30
+        # Pooled sessions for requests (no retries for local calls like Ollama
+        # or for connection tests, which should fail fast)
+        self.session = create_session()
+        self.local_session = create_session(pool_connections=1, pool_maxsize=8, retries=0)
+        self.probe_session = create_session(pool_connections=4, pool_maxsize=4, retries=0)
 
         # Available free models
         self.free_models = {
@@ -197,6 +209,26 @@ class LLMAPIManager:
         
         return results
     
+    def warm_up(self):
+        """
+        Open pooled connections to the configured LLM APIs
+        
+        Sends a cheap HEAD request per provider so DNS and TLS setup happen
+        before the first real request. No tokens or rate budget are spent.
+        """
+        endpoints = []
+        if self.groq_api_key:
+            endpoints.append(('groq', self.groq_url))
+        if self.huggingface_api_key:
+            endpoints.append(('huggingface', self.hf_url))
+        
+        for name, url in endpoints:
+            try:
+                self.session.head(url, timeout=5)
+                logger.info(f"🔥 {name} connection warmed up")
+            except Exception as e:
+                logger.warning(f"⚠️ {name} warm-up failed: {str(e)}")
+    
     def _test_groq_connection(self) -> bool:
         """Test Groq API connection"""
         try:
@@ -211,7 +243,8 @@ class LLMAPIManager:
                 'max_tokens': 10
             }
             
-            response = self.session.post(self.groq_url, headers=headers, json=payload, timeout=10)
+            with self.groq_limiter.slot():
+                response = self.probe_session.post(self.groq_url, headers=headers, json=payload, timeout=10)
             
             if response.status_code == 200:
                 logger.info("✅ Groq API connection successful")
@@ -236,7 +269,7 @@ class LLMAPIManager:
             url = f"{self.hf_url}/microsoft/DialoGPT-medium"
             payload = {'inputs': 'Hello'}
             
-            response = self.session.post(url, headers=headers, json=payload, timeout=10)
+            response = self.probe_session.post(url, headers=headers, json=payload, timeout=10)
             
             if response.status_code == 200:
                 logger.info("✅ Hugging Face API connection successful")
@@ -253,18 +286,20 @@ class LLMAPIManager:
         """Test free APIs that don't require authentication"""
         try:
             # Test a free API endpoint
-            response = self.session.get("https://httpbin.org/status/200", timeout=5)
+            response = self.probe_session.get("https://httpbin.org/status/200", timeout=5)
             return response.status_code == 200
         except:
             return False
     
-    def enhance_content(self, text: str, enhancement_type: str = 'general') -> str:
+    def enhance_content(self, text: str, enhancement_type: str = 'general',
+                        priority: int = 0) -> str:
         """
         Enhance content using available LLM APIs
         
         Args:
             text: Input text to enhance
             enhancement_type: Type of enhancement (general, creative, formal, etc.)
+            priority: Groq queue priority, lower values are served first
             
         Returns:
             Enhanced text
@@ -276,7 +311,7 @@ class LLMAPIManager:
         
         # Try Groq API first (if available)
         if self.groq_api_key:
-            enhanced = self._enhance_with_groq(text, enhancement_type)
+            enhanced = self._enhance_with_groq(text, enhancement_type, priority)
             if enhanced and enhanced != text:
                 return enhanced
         
@@ -325,7 +360,7 @@ class LLMAPIManager:
         # Fallback to local enhancement
         return self._fallback_enhance(text, enhancement_type)
     
-    def _enhance_with_groq(self, text: str, enhancement_type: str) -> str:
+    def _enhance_with_groq(self, text: str, enhancement_type: str, priority: int = 0) -> str:
         """Enhance text using Groq API"""
         try:
             headers = {
@@ -350,7 +385,8 @@ class LLMAPIManager:
                 'temperature': 0.7
             }
             
-            response = self.session.post(self.groq_url, headers=headers, json=payload, timeout=30)
+            with self.groq_limiter.slot(priority):
+                response = self.session.post(self.groq_url, headers=headers, json=payload, timeout=30)
             
             if response.status_code == 200:
                 data = response.json()
@@ -520,11 +556,12 @@ class LLMAPIManager:
         # Test Groq API
         try:
             if self.groq_client:
-                response = self.groq_client.chat.completions.create(
-                    messages=[{"role": "user", "content": "test"}],
-                    model="llama3-8b-8192",
-                    max_tokens=5
-                )
+                with self.groq_limiter.slot():
+                    response = self.groq_client.chat.completions.create(
+                        messages=[{"role": "user", "content": "test"}],
+                        model="llama3-8b-8192",
+                        max_tokens=5
+                    )
                 results['groq'] = {'status': 'online', 'model': 'llama3-8b-8192'}
             else:
                 results['groq'] = {'status': 'offline', 'error': 'No API key'}
@@ -534,7 +571,7 @@ class LLMAPIManager:
         # Test Hugging Face API
         try:
             if self.hf_token:
-                response = requests.post(
+                response = self.session.post(
                     "https://api-inference.huggingface.co/models/microsoft/DialoGPT-medium",
                     headers={"Authorization": f"Bearer {self.hf_token}"},
                     json={"inputs": "test"},
@@ -658,10 +695,8 @@ class LLMAPIManager:
             Enhanced text
         """
         try:
-            import requests
-
             # Check if Ollama is running locally
-            response = requests.post(
+            response = self.local_session.post(
                 'http://localhost:11434/api/generate',
                 json={
                     'model': model,
@@ -0,0 +1,100 @@
+"""
+Priority Rate Limiter
+=====================
+Token-bucket rate limiting with a priority queue for outbound LLM API calls.
+Keeps Groq usage under its requests-per-minute cap while letting interactive
+requests go ahead of background work.
+"""
+
+import heapq
+import itertools
+import logging
+import threading
+import time
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+class PriorityRateLimiter:
+    """
+    Thread-safe token bucket with priority ordering and a concurrency cap
+    
+    Callers wait in a priority queue (lower number = served first, FIFO
+    within a priority) until a token and a concurrency slot are available.
+    """
+    
+    def __init__(self, max_rate: int = 480, time_period: float = 60.0,
+                 max_concurrent: int = 24):
+        """
+        Initialize the rate limiter
+        
+        Args:
+            max_rate: Requests allowed per time period (also the burst size)
+            time_period: Length of the rate window in seconds
+            max_concurrent: Maximum requests in flight at once
+        """
+        self.max_rate = max_rate
+        self.max_concurrent = max_concurrent
+        self._refill_rate = max_rate / time_period
+        self._tokens = float(max_rate)
+        self._last_refill = time.monotonic()
+        self._active = 0
+        self._waiters = []
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+    
+    def _refill(self):
+        """Add the tokens earned since the last refill"""
+        now = time.monotonic()
+        self._tokens = min(self.max_rate, self._tokens + (now - self._last_refill) * self._refill_rate)
+        self._last_refill = now
+    
+    @contextmanager
+    def slot(self, priority: int = 0):
+        """
+        Block until this caller may make a request, and hold a slot meanwhile
+        
+        Args:
+            priority: Queue priority, lower values are served first
+        """
+        entry = (priority, next(self._sequence))
+        with self._condition:
+            heapq.heappush(self._waiters, entry)
+            try:
+                while True:
+                    self._refill()
+                    if (self._waiters[0] == entry and self._tokens >= 1
+                            and self._active < self.max_concurrent):
+                        break
+                    # Sleep until a token is due, or until another caller finishes
+                    timeout = None
+                    if self._tokens < 1:
+                        timeout = (1 - self._tokens) / self._refill_rate
+                    self._condition.wait(timeout)
+            except BaseException:
+                self._waiters.remove(entry)
+                heapq.heapify(self._waiters)
+                self._condition.notify_all()
+                raise
+            heapq.heappop(self._waiters)
+            self._tokens -= 1
+            self._active += 1
+            # Let the next waiter re-check now that the head has moved
+            self._condition.notify_all()
+        
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._active -= 1
+                self._condition.notify_all()
+    
+    def get_status(self) -> dict:
+        """Get current limiter usage"""
+        with self._condition:
+            self._refill()
+            return {
+                'tokens_available': int(self._tokens),
+                'active_requests': self._active,
+                'queued_requests': len(self._waiters)
+            }
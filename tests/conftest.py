@@ -0,0 +1,9 @@
+"""
+Shared pytest setup for the EchoVerse unit tests
+"""
+
+import os
+import sys
+
+# Make the top-level packages (app, services, models, audio, utils) importable
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
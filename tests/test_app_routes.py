@@ -0,0 +1,115 @@
+"""
+Smoke tests for the audiobook processing routes, with the AI services faked out
+"""
+
+import pytest
+
+import app as echoverse_app
+
+
+class FakeBatcher:
+    def transform(self, text, tone='neutral'):
+        return f"[{tone}] {text}"
+
+
+class FakeLLMManager:
+    def enhance_content(self, text, enhancement_type='general', priority=0):
+        return text.upper()
+
+
+class FakeAIFeatures:
+    def analyze_content(self, text):
+        return {
+            'word_count': len(text.split()),
+            'detected_genre': 'general',
+            'sentiment': 'neutral',
+            'recommended_voice': 'wise_narrator',
+            'emotions': {'primary': 'neutral', 'intensity': 0.5},
+            'themes': []
+        }
+
+
+class FakeTTSEngine:
+    def __init__(self, audio_dir):
+        self.audio_dir = audio_dir
+        self.texts = []
+
+    def generate_audio(self, text, language='en', emotion_data=None, voice_style='neutral'):
+        self.texts.append(text)
+        path = self.audio_dir / f"audiobook_{len(self.texts)}.mp3"
+        path.write_bytes(text.encode('utf-8'))
+        return str(path)
+
+    def generate_audio_stream(self, text, language='en', emotion_data=None, voice_style='neutral'):
+        self.texts.append(text)
+        yield text.encode('utf-8')
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / 'static' / 'audio').mkdir(parents=True)
+    tts_engine = FakeTTSEngine(tmp_path)
+
+    monkeypatch.setattr(echoverse_app, '_services_ready', True)
+    monkeypatch.setattr(echoverse_app, 'granite_client', object())
+    monkeypatch.setattr(echoverse_app, 'granite_batcher', FakeBatcher())
+    monkeypatch.setattr(echoverse_app, 'llm_manager', FakeLLMManager())
+    monkeypatch.setattr(echoverse_app, 'ai_features', FakeAIFeatures())
+    monkeypatch.setattr(echoverse_app, 'tts_engine', tts_engine)
+
+    with echoverse_app.app.test_client() as test_client:
+        test_client.tts_engine = tts_engine
+        yield test_client
+
+
+def test_process_returns_job_and_stores_metadata(client, tmp_path):
+    response = client.post('/api/process', json={'text': 'First part.\n\nSecond part.', 'tone': 'dramatic'})
+
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data['status'] == 'completed'
+    assert data['audio_file'] == f"{data['job_id']}.mp3"
+    assert data['analysis'] == {
+        'word_count': 4,
+        'detected_genre': 'general',
+        'sentiment': 'neutral',
+        'recommended_voice': 'wise_narrator'
+    }
+    assert client.tts_engine.texts == ['[DRAMATIC] FIRST PART.\n\n[DRAMATIC] SECOND PART.']
+
+    assert (tmp_path / 'static' / 'audio' / data['audio_file']).exists()
+
+    metadata = client.get(data['metadata_url']).get_json()['metadata']
+    assert metadata['transformed_text'] == '[dramatic] First part.\n\n[dramatic] Second part.'
+    assert metadata['enhanced_text'] == '[DRAMATIC] FIRST PART.\n\n[DRAMATIC] SECOND PART.'
+
+
+def test_process_requires_text(client):
+    response = client.post('/api/process', json={'text': '   '})
+
+    assert response.status_code == 400
+
+
+def test_unknown_job_metadata_is_404(client):
+    response = client.get('/api/jobs/missing/metadata')
+
+    assert response.status_code == 404
+
+
+def test_process_stream_yields_audio_per_paragraph(client, monkeypatch):
+    persisted = {}
+
+    def persist(job_id, chunks):
+        persisted[job_id] = chunks
+
+    monkeypatch.setattr(echoverse_app, '_persist_streamed_audio', persist)
+
+    response = client.post('/api/process/stream', json={'text': 'One.\n\nTwo.\n\nThree.', 'tone': 'calming'})
+
+    assert response.status_code == 200
+    assert response.mimetype == 'audio/mpeg'
+    assert response.data == b'[CALMING] ONE.[CALMING] TWO.[CALMING] THREE.'
+    assert persisted[response.headers['X-Job-Id']] == [
+        b'[CALMING] ONE.', b'[CALMING] TWO.', b'[CALMING] THREE.'
+    ]
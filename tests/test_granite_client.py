@@ -0,0 +1,152 @@
+"""
+Tests for the Granite API client and micro-batcher, with the HTTP session faked out
+"""
+
+import pytest
+import requests
+
+from services.granite_client import GraniteAPIClient, GraniteBatcher
+
+
+class FakeResponse:
+    def __init__(self, status_code=200, body=None, lines=None, fail_after=None):
+        self.status_code = status_code
+        self.headers = {'Content-Type': 'text/event-stream' if lines is not None else 'application/json'}
+        self._body = body
+        self._lines = lines or []
+        self._fail_after = fail_after
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def json(self):
+        return self._body
+
+    def iter_lines(self, decode_unicode=False):
+        for index, line in enumerate(self._lines):
+            if index == self._fail_after:
+                raise requests.exceptions.ConnectionError("connection dropped")
+            yield line
+
+
+class FakeSession:
+    """Answers /transform requests with respond(payload), recording every payload"""
+
+    def __init__(self, respond):
+        self.respond = respond
+        self.payloads = []
+
+    def post(self, url, json=None, **kwargs):
+        self.payloads.append(json)
+        return self.respond(json)
+
+
+def upper_json(payload):
+    return FakeResponse(body={'status': 'success', 'transformed_text': payload['text'].upper()})
+
+
+@pytest.fixture
+def client():
+    return GraniteAPIClient('http://granite.test')
+
+
+def test_transform_rows_sends_one_request_and_splits_rows(client):
+    client.session = FakeSession(upper_json)
+
+    assert client.transform_rows(['one', 'two', 'three'], 'formal') == ['ONE', 'TWO', 'THREE']
+    assert len(client.session.payloads) == 1
+
+    # Rows are cached individually, so only the new row is sent next time
+    assert client.transform_rows(['two', 'four'], 'formal') == ['TWO', 'FOUR']
+    assert [payload['text'] for payload in client.session.payloads[1:]] == ['four']
+
+
+def test_transform_rows_falls_back_to_single_requests_without_delimiters(client):
+    def respond(payload):
+        if '---ROW' in payload['text']:
+            return FakeResponse(body={'status': 'success', 'transformed_text': 'merged output'})
+        return upper_json(payload)
+
+    client.session = FakeSession(respond)
+
+    assert client.transform_rows(['one', 'two'], 'formal') == ['ONE', 'TWO']
+    assert len(client.session.payloads) == 3
+
+
+def test_transform_rows_uses_local_fallback_when_api_fails(client):
+    client.session = FakeSession(lambda payload: FakeResponse(status_code=500))
+
+    results = client.transform_rows(['It was dark.', 'It was cold.'], 'suspenseful')
+
+    assert results == [client._fallback_transform(text, 'suspenseful') for text in ['It was dark.', 'It was cold.']]
+    assert results[0] != 'It was dark.'
+
+
+def test_batcher_coalesces_requests_per_tone():
+    calls = []
+
+    class RecordingClient:
+        def transform_rows(self, texts, tone):
+            calls.append((tone, list(texts)))
+            return [f"{tone}:{text}" for text in texts]
+
+    batcher = GraniteBatcher(RecordingClient(), window=0.2)
+    futures = [batcher.submit('a', 'calming'), batcher.submit('b', 'dramatic'), batcher.submit('c', 'calming')]
+
+    assert [future.result(timeout=5) for future in futures] == ['calming:a', 'dramatic:b', 'calming:c']
+    assert sorted(calls) == [('calming', ['a', 'c']), ('dramatic', ['b'])]
+    assert batcher.submit('  ').result(timeout=1) == '  '
+
+
+def test_batcher_propagates_client_errors():
+    class FailingClient:
+        def transform_rows(self, texts, tone):
+            raise RuntimeError("granite down")
+
+    batcher = GraniteBatcher(FailingClient(), window=0)
+
+    with pytest.raises(RuntimeError, match="granite down"):
+        batcher.transform('text', 'calming')
+
+
+def test_transform_text_stream_yields_sse_tokens(client):
+    client.session = FakeSession(lambda payload: FakeResponse(lines=[
+        'data: {"token": "Hello"}', '', ': keep-alive', 'data: {"token": " world"}', 'data: [DONE]'
+    ]))
+
+    assert list(client.transform_text_stream('hi there', 'dramatic')) == ['Hello', ' world']
+    assert client.session.payloads[0]['stream'] is True
+
+    # The joined result is cached for the buffering wrapper
+    assert client.transform_text('hi there', 'dramatic') == 'Hello world'
+    assert len(client.session.payloads) == 1
+
+
+def test_transform_text_stream_accepts_json_responses(client):
+    client.session = FakeSession(upper_json)
+
+    assert list(client.transform_text_stream('plain reply', 'calming')) == ['PLAIN REPLY']
+
+
+def test_transform_text_falls_back_when_stream_breaks(client):
+    client.session = FakeSession(lambda payload: FakeResponse(
+        lines=['data: {"token": "Partial"}', 'data: {"token": " output"}'], fail_after=1
+    ))
+
+    stream = client.transform_text_stream('It was dark.', 'suspenseful')
+    assert next(stream) == 'Partial'
+    with pytest.raises(requests.exceptions.RequestException):
+        next(stream)
+
+    assert client.transform_text('It was dark.', 'suspenseful') == client._fallback_transform('It was dark.', 'suspenseful')
+
+
+def test_transform_text_stream_falls_back_on_error_event(client):
+    client.session = FakeSession(lambda payload: FakeResponse(lines=['data: {"error": "boom"}']))
+
+    assert list(client.transform_text_stream('It was dark.', 'suspenseful')) == [
+        client._fallback_transform('It was dark.', 'suspenseful')
+    ]
@@ -0,0 +1,47 @@
+"""
+Tests for GraniteModel loading, with the HuggingFace download faked out
+"""
+
+import threading
+import time
+
+import pytest
+
+pytest.importorskip('torch')
+pytest.importorskip('transformers')
+
+from models import granite_model
+from models.granite_model import GraniteModel
+
+
+def test_concurrent_loads_agree_on_mock_fallback(monkeypatch):
+    entered = threading.Event()
+    release = threading.Event()
+
+    def unavailable(*args, **kwargs):
+        entered.set()
+        release.wait(timeout=5)
+        raise OSError("no network")
+
+    monkeypatch.setattr(granite_model.AutoTokenizer, 'from_pretrained', unavailable)
+    model = GraniteModel()
+    results = {}
+
+    def load(name):
+        results[name] = model.load_model()
+
+    loader = threading.Thread(target=load, args=('loader',))
+    loader.start()
+    assert entered.wait(timeout=5)
+
+    # The second caller arrives while the first is still loading and waits for it
+    waiter = threading.Thread(target=load, args=('waiter',))
+    waiter.start()
+    time.sleep(0.05)
+    release.set()
+    loader.join(timeout=5)
+    waiter.join(timeout=5)
+
+    assert results == {'loader': True, 'waiter': True}
+    assert model.is_mock
+    assert model.transform_text('He walked home.', 'calming')
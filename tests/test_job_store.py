@@ -0,0 +1,50 @@
+"""
+Tests for the in-process job result store
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from services import job_store
+from services.job_store import JobStore
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(job_store, 'time', SimpleNamespace(monotonic=lambda: now[0]))
+    return now
+
+
+def test_get_returns_stored_data(clock):
+    store = JobStore()
+    store.put('job', {'text': 'hello'})
+
+    assert store.get('job') == {'text': 'hello'}
+    assert store.get('missing') is None
+
+
+def test_entries_expire_after_ttl(clock):
+    store = JobStore(ttl=10)
+    store.put('job', {'text': 'hello'})
+
+    clock[0] += 10
+    assert store.get('job') == {'text': 'hello'}
+
+    clock[0] += 0.5
+    assert store.get('job') is None
+    assert len(store) == 0
+
+
+def test_evicts_least_recently_used_jobs(clock):
+    store = JobStore(maxsize=2)
+    store.put('a', {})
+    store.put('b', {})
+    store.get('a')
+    store.put('c', {})
+
+    assert store.get('b') is None
+    assert store.get('a') == {}
+    assert store.get('c') == {}
+    assert len(store) == 2
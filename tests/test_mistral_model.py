@@ -0,0 +1,42 @@
+"""
+Tests for the Mistral emotion analysis handler
+"""
+
+import pytest
+
+from models.mistral_model import MistralModel
+
+
+def test_mock_model_does_not_probe_torch(monkeypatch):
+    def fail():
+        raise AssertionError("device probed while building the demo engine")
+
+    monkeypatch.setattr(MistralModel, '_get_optimal_device', lambda self: fail())
+
+    model = MistralModel()
+
+    assert model.is_loaded()
+    assert model.load_model()
+    assert model.device == 'cpu'
+
+
+def test_real_model_resolves_device_on_load(monkeypatch):
+    monkeypatch.setattr(MistralModel, '_get_optimal_device', lambda self: 'mps')
+    monkeypatch.setattr(MistralModel, '_load_emotion_classifier', lambda self: None)
+    monkeypatch.setattr('models.mistral_model.time.sleep', lambda seconds: None)
+
+    model = MistralModel(mock=False)
+    assert model.device is None
+
+    assert model.load_model()
+    assert model.device == 'mps'
+
+
+@pytest.mark.parametrize('text, emotion', [
+    ('What a happy, joyful and wonderful day!', 'joy'),
+    ('The dark shadows brought fear and terror.', 'fear'),
+])
+def test_analyze_emotions_picks_keyword_emotion(text, emotion):
+    result = MistralModel().analyze_emotions(text)
+
+    assert result['primary_emotion'] == emotion
@@ -0,0 +1,68 @@
+"""
+Tests for the shared model weight registry
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from models import model_registry
+
+
+def test_same_key_loads_once_and_frees_on_last_release():
+    key = model_registry.weights_key('test/shared', 'cpu', 'transformers', torch_dtype='float32')
+    loads = []
+
+    first = model_registry.acquire(key, lambda: loads.append(1) or object())
+    second = model_registry.acquire(key, lambda: loads.append(1) or object())
+
+    assert first is second
+    assert len(loads) == 1
+    assert not model_registry.release(key)
+    assert model_registry.release(key)
+    assert not model_registry.release(key)
+
+
+def test_load_settings_are_part_of_the_key():
+    base = model_registry.weights_key('test/settings', 'cpu', 'transformers', torch_dtype='float32', compiled=False)
+
+    assert base == model_registry.weights_key('test/settings', 'cpu', 'transformers', compiled=False, torch_dtype='float32')
+    assert base != model_registry.weights_key('test/settings', 'cpu', 'transformers', torch_dtype='float16', compiled=False)
+    assert base != model_registry.weights_key('test/settings', 'cpu', 'transformers', torch_dtype='float32', compiled=True)
+    assert base != model_registry.weights_key('test/settings', 'cpu', 'demo', torch_dtype='float32', compiled=False)
+
+
+def test_llama_pipelines_share_weights(monkeypatch):
+    pytest.importorskip('torch')
+    pytest.importorskip('transformers')
+    from models import llama_model
+
+    loads = []
+    monkeypatch.setattr(llama_model.AutoTokenizer, 'from_pretrained',
+                        lambda name, **kwargs: SimpleNamespace(pad_token_id=None, eos_token_id=0))
+    monkeypatch.setattr(llama_model.AutoModelForCausalLM, 'from_pretrained',
+                        lambda name, **kwargs: loads.append(kwargs) or object())
+    monkeypatch.setattr(llama_model, 'pipeline', lambda task, **kwargs: kwargs)
+
+    first = llama_model.LlamaModel('test/llama', use_pipeline=True)
+    second = llama_model.LlamaModel('test/llama', use_pipeline=True)
+    assert first.load_model() and second.load_model()
+
+    assert len(loads) == 1
+    assert first.model['model'] is second.model['model']
+    assert first._registry_key == model_registry.weights_key(
+        'test/llama', first.device, 'transformers', attn_implementation=None, compiled=False, **loads[0]
+    )
+
+    # The weights stay loaded until the last handler unloads
+    first.unload_model()
+    third = llama_model.LlamaModel('test/llama', use_pipeline=True)
+    assert third.load_model()
+    assert len(loads) == 1
+
+    second.unload_model()
+    third.unload_model()
+    reloaded = llama_model.LlamaModel('test/llama', use_pipeline=True)
+    assert reloaded.load_model()
+    assert len(loads) == 2
+    reloaded.unload_model()
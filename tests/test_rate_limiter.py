@@ -0,0 +1,60 @@
+"""
+Tests for the priority token-bucket rate limiter
+"""
+
+import threading
+import time
+
+from services.rate_limiter import PriorityRateLimiter
+
+
+def _wait_for_queue(limiter, size, timeout=5):
+    deadline = time.monotonic() + timeout
+    while limiter.get_status()['queued_requests'] < size:
+        assert time.monotonic() < deadline, "waiters never queued"
+        time.sleep(0.001)
+
+
+def test_waiters_are_served_by_priority_then_arrival():
+    limiter = PriorityRateLimiter(max_rate=100, max_concurrent=1)
+    order = []
+
+    def worker(name, priority):
+        with limiter.slot(priority):
+            order.append(name)
+
+    threads = []
+    with limiter.slot():
+        # Queue one waiter at a time so arrival order is deterministic
+        for name, priority in [('low', 5), ('high-1', 1), ('mid', 3), ('high-2', 1)]:
+            thread = threading.Thread(target=worker, args=(name, priority))
+            thread.start()
+            threads.append(thread)
+            _wait_for_queue(limiter, len(threads))
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert order == ['high-1', 'high-2', 'mid', 'low']
+
+
+def test_slot_spends_a_token_and_tracks_active_requests():
+    limiter = PriorityRateLimiter(max_rate=3, time_period=3600, max_concurrent=2)
+
+    with limiter.slot():
+        status = limiter.get_status()
+        assert status['active_requests'] == 1
+        assert status['tokens_available'] == 2
+
+    assert limiter.get_status()['active_requests'] == 0
+
+
+def test_waits_for_a_token_when_the_bucket_is_empty():
+    limiter = PriorityRateLimiter(max_rate=1, time_period=0.05)
+
+    with limiter.slot():
+        pass
+    started = time.monotonic()
+    with limiter.slot():
+        pass
+
+    assert time.monotonic() - started >= 0.03
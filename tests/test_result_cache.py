@@ -0,0 +1,44 @@
+"""
+Tests for the model result LRU cache
+"""
+
+from models.result_cache import ResultCache
+
+
+def test_evicts_least_recently_used():
+    cache = ResultCache(maxsize=2)
+    cache.put(ResultCache.key('a'), 1)
+    cache.put(ResultCache.key('b'), 2)
+
+    # Reading 'a' makes 'b' the least recently used entry
+    assert cache.get(ResultCache.key('a')) == 1
+    cache.put(ResultCache.key('c'), 3)
+
+    assert cache.get(ResultCache.key('b')) is None
+    assert cache.get(ResultCache.key('a')) == 1
+    assert cache.get(ResultCache.key('c')) == 3
+
+
+def test_put_refreshes_existing_key():
+    cache = ResultCache(maxsize=2)
+    cache.put(ResultCache.key('a'), 1)
+    cache.put(ResultCache.key('b'), 2)
+    cache.put(ResultCache.key('a'), 10)
+    cache.put(ResultCache.key('c'), 3)
+
+    assert cache.get(ResultCache.key('a')) == 10
+    assert cache.get(ResultCache.key('b')) is None
+
+
+def test_key_includes_options():
+    assert ResultCache.key('text', 'calm') == ResultCache.key('text', 'calm')
+    assert ResultCache.key('text', 'calm') != ResultCache.key('text', 'dramatic')
+    assert ResultCache.key('text') != ResultCache.key('other')
+
+
+def test_clear_drops_everything():
+    cache = ResultCache()
+    cache.put(ResultCache.key('a'), 1)
+    cache.clear()
+
+    assert cache.get(ResultCache.key('a')) is None
@@ -0,0 +1,39 @@
+"""
+Tests for the startup script's service checks
+"""
+
+import logging
+import socket
+
+import pytest
+
+from run_echoverse import EchoVerseStarter
+
+
+@pytest.fixture
+def listener():
+    server = socket.socket()
+    server.bind(('127.0.0.1', 0))
+    server.listen()
+    yield server
+    server.close()
+
+
+@pytest.mark.parametrize('url_format', ['http://127.0.0.1:{port}', '127.0.0.1:{port}'])
+def test_granite_probe_reaches_host(listener, monkeypatch, caplog, url_format):
+    monkeypatch.setenv('GRANITE_API_URL', url_format.format(port=listener.getsockname()[1]))
+
+    with caplog.at_level(logging.INFO, logger='run_echoverse'):
+        assert EchoVerseStarter().test_services()
+
+    assert 'Granite API host reachable' in caplog.text
+    assert 'connection failed' not in caplog.text
+
+
+def test_granite_probe_reports_invalid_url(monkeypatch, caplog):
+    monkeypatch.setenv('GRANITE_API_URL', 'http://')
+
+    with caplog.at_level(logging.INFO, logger='run_echoverse'):
+        assert EchoVerseStarter().test_services()
+
+    assert 'Invalid GRANITE_API_URL' in caplog.text
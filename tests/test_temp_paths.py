@@ -0,0 +1,18 @@
+"""
+Tests for the shared temp-path helper used by the TTS engines
+"""
+
+import os
+
+from utils.temp_paths import make_temp_path
+
+
+def test_temp_path_is_unique_sibling_keeping_extension():
+    final_path = os.path.join('static', 'audio', 'clip.mp3')
+
+    first, second = make_temp_path(final_path), make_temp_path(final_path)
+
+    assert first != second
+    assert os.path.dirname(first) == os.path.dirname(final_path)
+    assert first.startswith(os.path.join('static', 'audio', 'clip.'))
+    assert first.endswith('.part.mp3')
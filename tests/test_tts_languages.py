@@ -0,0 +1,23 @@
+"""
+Tests for the TTS engines' supported-language tables
+"""
+
+import json
+
+import pytest
+
+from audio.professional_tts import ProfessionalTTSEngine
+from audio.tts_engine import AdvancedTTSEngine
+
+
+@pytest.mark.parametrize('engine_class', [ProfessionalTTSEngine, AdvancedTTSEngine])
+def test_supported_languages_is_a_serializable_copy(engine_class):
+    engine = engine_class()
+    languages = engine.get_supported_languages()
+
+    assert type(languages) is dict
+    assert languages['en'] == 'English'
+    assert json.loads(json.dumps(languages)) == languages
+
+    languages['xx'] = 'Test'
+    assert 'xx' not in engine.get_supported_languages()
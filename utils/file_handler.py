@@ -5,6 +5,7 @@ Professional file handling utilities for EchoVerse.
 Supports multiple file formats and text extraction.
 """
 
+import io
 import os
 import logging
 from typing import List, Optional
@@ -145,51 +146,92 @@ class FileHandler:
             logger.error(f"File validation failed: {validation['error']}")
             return ""
         
-        file_ext = validation['extension']
+        try:
+            with open(filepath, 'rb') as file:
+                data = file.read()
+        except Exception as e:
+            logger.error(f"Error reading {filepath}: {str(e)}")
+            return ""
+        
+        return self._extract_from_bytes(data, validation['extension'], filepath)
+    
+    def extract_text_from_file(self, file, filename: Optional[str] = None) -> str:
+        """
+        Extract text from an uploaded file without writing it to disk
+        
+        Args:
+            file: Uploaded file (werkzeug FileStorage) or binary stream
+            filename: Original filename, if it cannot be read from ``file``
+            
+        Returns:
+            Extracted text content
+        """
+        filename = filename or getattr(file, 'filename', None) or ''
+        if not self.allowed_file(filename):
+            logger.error(f"File type not supported: {filename}")
+            return ""
+        
+        stream = getattr(file, 'stream', file)
+        data = stream.read(self.max_file_size + 1)
+        if len(data) > self.max_file_size:
+            logger.error(f"File too large: {filename}")
+            return ""
         
+        return self._extract_from_bytes(data, Path(filename).suffix.lower(), filename)
+    
+    def _extract_from_bytes(self, data: bytes, file_ext: str, source: str) -> str:
+        """
+        Dispatch raw file contents to the extractor for their format
+        
+        Args:
+            data: Raw file contents
+            file_ext: Lower-case file extension, including the dot
+            source: File name or path, for log messages
+            
+        Returns:
+            Extracted text content
+        """
         try:
             if file_ext == '.txt':
-                return self._extract_from_txt(filepath)
+                return self._extract_from_txt(data)
             elif file_ext == '.md':
-                return self._extract_from_markdown(filepath)
+                return self._extract_from_markdown(data)
             elif file_ext == '.rtf':
-                return self._extract_from_rtf(filepath)
+                return self._extract_from_rtf(data)
             elif file_ext == '.docx':
-                return self._extract_from_docx(filepath)
+                return self._extract_from_docx(data)
             elif file_ext == '.pdf':
-                return self._extract_from_pdf(filepath)
+                return self._extract_from_pdf(data)
             elif file_ext in ['.html', '.htm']:
-                return self._extract_from_html(filepath)
+                return self._extract_from_html(data)
             else:
                 logger.error(f"Unsupported file type: {file_ext}")
                 return ""
                 
         except Exception as e:
-            logger.error(f"Error extracting text from {filepath}: {str(e)}")
+            logger.error(f"Error extracting text from {source}: {str(e)}")
             return ""
     
-    def _extract_from_txt(self, filepath: str) -> str:
-        """Extract text from plain text file"""
+    def _extract_from_txt(self, data: bytes) -> str:
+        """Extract text from plain text file contents"""
         encodings = ['utf-8', 'utf-16', 'latin-1', 'cp1252']
         
         for encoding in encodings:
             try:
-                with open(filepath, 'r', encoding=encoding) as file:
-                    return file.read()
+                text = data.decode(encoding)
             except UnicodeDecodeError:
                 continue
-            except Exception as e:
-                logger.error(f"Error reading text file: {str(e)}")
-                break
+            # Match text-mode universal newline handling
+            return text.replace('\r\n', '\n').replace('\r', '\n')
         
         return ""
     
-    def _extract_from_markdown(self, filepath: str) -> str:
-        """Extract text from Markdown file"""
+    def _extract_from_markdown(self, data: bytes) -> str:
+        """Extract text from Markdown file contents"""
         try:
             # For now, treat as plain text
             # Could be enhanced to parse Markdown and extract clean text
-            text = self._extract_from_txt(filepath)
+            text = self._extract_from_txt(data)
             
             # Basic Markdown cleanup
             import re
@@ -216,11 +258,10 @@ class FileHandler:
             logger.error(f"Error extracting from Markdown: {str(e)}")
             return ""
     
-    def _extract_from_rtf(self, filepath: str) -> str:
-        """Extract text from RTF file (basic implementation)"""
+    def _extract_from_rtf(self, data: bytes) -> str:
+        """Extract text from RTF file contents (basic implementation)"""
         try:
-            with open(filepath, 'r', encoding='utf-8', errors='ignore') as file:
-                content = file.read()
+            content = data.decode('utf-8', errors='ignore')
             
             # Basic RTF parsing - remove RTF control codes
             import re
@@ -240,8 +281,8 @@ class FileHandler:
             logger.error(f"Error extracting from RTF: {str(e)}")
             return ""
     
-    def _extract_from_docx(self, filepath: str) -> str:
-        """Extract text from DOCX file"""
+    def _extract_from_docx(self, data: bytes) -> str:
+        """Extract text from DOCX file contents"""
         if not self.docx_available:
             logger.error("python-docx not available for DOCX extraction")
             return ""
@@ -249,7 +290,7 @@ class FileHandler:
         try:
             import docx
             
-            doc = docx.Document(filepath)
+            doc = docx.Document(io.BytesIO(data))
             text_content = []
             
             # Extract text from paragraphs
@@ -270,8 +311,8 @@ class FileHandler:
             logger.error(f"Error extracting from DOCX: {str(e)}")
             return ""
     
-    def _extract_from_pdf(self, filepath: str) -> str:
-        """Extract text from PDF file"""
+    def _extract_from_pdf(self, data: bytes) -> str:
+        """Extract text from PDF file contents"""
         if not self.pdf_available:
             logger.error("PyPDF2 not available for PDF extraction")
             return ""
@@ -281,13 +322,12 @@ class FileHandler:
             
             text_content = []
             
-            with open(filepath, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                
-                for page in pdf_reader.pages:
-                    text = page.extract_text()
-                    if text.strip():
-                        text_content.append(text)
+            pdf_reader = PyPDF2.PdfReader(io.BytesIO(data))
+            
+            for page in pdf_reader.pages:
+                text = page.extract_text()
+                if text.strip():
+                    text_content.append(text)
             
             return '\n'.join(text_content)
             
@@ -295,8 +335,8 @@ class FileHandler:
             logger.error(f"Error extracting from PDF: {str(e)}")
             return ""
     
-    def _extract_from_html(self, filepath: str) -> str:
-        """Extract text from HTML file"""
+    def _extract_from_html(self, data: bytes) -> str:
+        """Extract text from HTML file contents"""
         try:
             from html.parser import HTMLParser
             
@@ -322,8 +362,7 @@ class FileHandler:
                 def get_text(self):
                     return ' '.join(self.text_content)
             
-            with open(filepath, 'r', encoding='utf-8', errors='ignore') as file:
-                html_content = file.read()
+            html_content = data.decode('utf-8', errors='ignore')
             
             parser = HTMLTextExtractor()
             parser.feed(html_content)
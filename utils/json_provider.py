@@ -0,0 +1,31 @@
+"""
+Fast JSON Provider
+==================
+Flask JSON provider backed by orjson when it is installed.
+Falls back to Flask's default provider otherwise.
+"""
+
+from flask.json.provider import DefaultJSONProvider, _default
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """
+    JSON provider that serializes with orjson
+    
+    Types orjson does not handle natively (e.g. sets) go through Flask's
+    default conversion, so jsonify keeps accepting the same values.
+    """
+    
+    def dumps(self, obj, **kwargs) -> str:
+        """Serialize obj to a JSON string"""
+        return orjson.dumps(obj, default=_default, option=orjson.OPT_NON_STR_KEYS).decode()
+    
+    def loads(self, s, **kwargs):
+        """Deserialize a JSON string or bytes"""
+        return orjson.loads(s)
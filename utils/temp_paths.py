@@ -0,0 +1,27 @@
+"""
+Temporary Output Paths
+======================
+Private sibling paths for writing a file before publishing it with os.replace,
+shared by the TTS engines so concurrent writers never see a partial file.
+"""
+
+import os
+import secrets
+
+
+def make_temp_path(final_path: str) -> str:
+    """
+    Return a private sibling path for writing final_path before os.replace
+
+    The random token keeps names unique across processes and containers that
+    share the audio directory (where PIDs can collide). The original extension
+    is kept last so backends that pick a format from the name still work.
+
+    Args:
+        final_path: Path the file will be published under
+
+    Returns:
+        Temporary path in the same directory as final_path
+    """
+    root, extension = os.path.splitext(final_path)
+    return f"{root}.{secrets.token_hex(8)}.part{extension}"